@@ -1,8 +1,7 @@
 """Z80 Assembler."""
 from enum import IntEnum, auto
-from typing import List
+from typing import List, Tuple
 # from collections import namedtuple
-# import tempfile
 import pprint
 
 from ..core import InstructionSet, InstructionPointer, ExpressionConversion
@@ -53,8 +52,13 @@ class Assembler:
     """The main assember class."""
 
     """The main entrypoint (class) to instantiate in order to compile any Z80 source."""
-    def __init__(self):
-        """Initialize the Assember class."""
+    def __init__(self, verbose=False, cache_dir=None):
+        """
+        Initialize the Assember class. An optional 'cache_dir' is handed to
+        the lexer so that unchanged source files are not tokenized again.
+        """
+        self.verbose = verbose
+        self.cache_dir = cache_dir
         self.filename = None
         self.reader = None
         self.line_no = 0
@@ -62,12 +66,15 @@ class Assembler:
         self.code: List[CodeNode] = []
         self.lexer = None
         self._np = None
+        # (index into self.code, section base address) of each node that
+        # pass2 has to revisit.
+        self._fixups: List[Tuple[int, int]] = []
 
     def load_from_file(self, filename):
         """Load the assembly program from a file."""
         self.filename = filename
         self.reader = FileReader(filename)
-        self.lexer = BasicLexer(self.reader)
+        self.lexer = BasicLexer(self.reader, cache_dir=self.cache_dir)
 
     def load_from_buffer(self, buffer_in):
         """Load the assembly program from a memory buffer."""
@@ -76,13 +83,20 @@ class Assembler:
 
     def parse(self):
         """Start the assembler's parser."""
+        # Per-parse state lives on the instance and is reset here so that
+        # re-parsing does not keep appending to the previous results.
+        self.code = []
+        self._fixups = []
         self._np = NodeProcessor(self.reader)
-        print("-------------- Stage 1 -------------")
+        if self.verbose:
+            print("-------------- Stage 1 -------------")
         self.pass1()
-        print("-------------- Stage 2 -------------")
+        if self.verbose:
+            print("-------------- Stage 2 -------------")
         self.pass2()
-        print("-------------- Results -------------")
-        self.print_code()
+        if self.verbose:
+            print("-------------- Results -------------")
+            self.print_code()
 
     def pass1(self):
         """Start parsing of the file specified in the Reader class."""
@@ -91,13 +105,19 @@ class Assembler:
         # exist in other files or be references to an undefined label.
         self._line_no = 0
         nodes: List[CodeNode] = []
+        ip = IP()
         # Pass 1 resolves symbols. Any global symbols are stored
-        # in the Global symbols array.
-        self.lexer.tokenize()
-        for node in self.lexer.tokenized_list():
+        # in the Global symbols array. Lines are consumed as they are
+        # tokenized and the position of each unresolved node is recorded
+        # so pass2 only has to revisit those.
+        for node in self.lexer.tokenize_iter():
             nodes = self._np.process_node(node)
             if nodes:
-                self.code.extend(nodes)
+                for code_node in nodes:
+                    if code_node and code_node.type_name == NODE:
+                        self._fixups.append((len(self.code),
+                                             ip.base_address))
+                    self.code.append(code_node)
 
     def pass2(self):
         """Resolve forward references."""
@@ -109,26 +129,35 @@ class Assembler:
         because it contained a forward referenced label within the same
         file. Otherwise, it's possibly a global label or an error.
         """
-        new_code: List[CodeNode] = []
-        IP().base_address = 0x0000
-        for (_, code_node) in enumerate(self.code):
-            type_name = code_node.type_name
+        # Fixups are patched in source order. 'shift' tracks how far the
+        # later positions have moved as resolved nodes are spliced in.
+        # The IP is put back where it was when each node was first seen so
+        # that relative jumps are computed from the right address.
+        ip = IP()
+        ec = EC()
+        end_base = ip.base_address
+        end_location = ip.location
+        shift = 0
+        for index, base in self._fixups:
+            index += shift
+            code_node = self.code[index]
             code = code_node.code_obj
-            if type_name == NODE:
-                if not is_node_valid(code):
-                    continue
+            new_nodes = None
+            if is_node_valid(code):
+                ip.base_address = ec.string_from_decimal(base, "$$")
+                ip.location = base + code_node.offset
                 new_nodes = self._np.process_node(code)
-                if new_nodes:
-                    new_code.extend(new_nodes)
-            else:
-                IP().move_relative(code_node.offset)
-                new_code.append(code_node)
-        self.code.clear()
-        self.code = new_code
+            new_nodes = new_nodes or []
+            self.code[index:index + 1] = new_nodes
+            shift += len(new_nodes) - 1
+        self._fixups.clear()
+        ip.base_address = ec.string_from_decimal(end_base, "$$")
+        ip.location = end_location
 
     def print_code(self):
         """Print out the code."""
-        pp = pprint.PrettyPrinter(indent=2, compact=False, width=40)
+        pp = None
+        ip = IP()
         for code_node in self.code:
             type_name = code_node.type_name
             type_name = type_name if type_name != INST else ""
@@ -136,10 +165,13 @@ class Assembler:
             code = code_node.code_obj
             if type_name == NODE:
                 print("Invalid instruction:")
+                if pp is None:
+                    pp = pprint.PrettyPrinter(indent=2, compact=False,
+                                              width=40)
                 pp.pprint(code)
                 continue
             desc = f"Type: {type_name}\n"
-            desc += f"{hex(IP().base_address + offset)}:   {code.__str__()}\n"
+            desc += f"{hex(ip.base_address + offset)}:   {code.__str__()}\n"
             # desc += f"Offset: {code_node.offset}\n"
             # desc += "Code:"
             # desc += pp.pformat(code.__str__())
@@ -182,7 +214,7 @@ SECTION "game", ROMX
     CP A
 """
 
-    assembler = Assembler()
+    assembler = Assembler(verbose=True)
     assembler.load_from_buffer(asm)
     assembler.parse()
 
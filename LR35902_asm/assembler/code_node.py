@@ -13,7 +13,6 @@ from enum import IntEnum, auto
 from collections import namedtuple
 from ..core import constants as const
 
-# import tempfile
 # import pprint
 
 # import core.constants as const
@@ -65,40 +64,26 @@ class CodeNode(object):
         length: Optional value that represents the length in bytes
                 of the code_obj.
     """
+    __slots__ = ("type", "type_name", "code_obj", "offset", "length")
 
     def __init__(self, type, code_obj, offset: CodeOffset, length=None):
         """Initialize a CodeNode object."""
-        self.type = type
+        # The type is validated and its name resolved once here since
+        # type_name is read for every node in each pass.
+        if not isinstance(type, const.NodeType):
+            type = const.NodeType.NODE
+        name = const.NODE_TYPES[type]
+        self.type: const.NodeType = type
+        self.type_name: str = name
         self.code_obj = code_obj
         self.offset = offset
         self.length = length
 
     def __str__(self):
         """Print a CodeNode object for debugging."""
-        desc = "\n"
-        desc += f"CodeNode: {self.type_name}:\n"
-        desc += f"   {self.code_obj.__str__()}\n"
-        desc += f"   Offset: {hex(self.offset).__str__()}\n"
-        return desc
-
-    @property
-    def type(self) -> const.NodeType:
-        """The const.NodeType value of the code_obj object."""
-        return self._type
-
-    @type.setter
-    def type(self, new_value: const.NodeType):
-        if new_value is not None and new_value in const.NODE_TYPES:
-            self._type = new_value
-        else:
-            self._type = const.NodeType.NODE
-
-    @property
-    def type_name(self) -> str:
-        """Returns the string representation of the const.NodeType."""
-        if self.type in const.NODE_TYPES:
-            return const.NODE_TYPES[self.type]
-        return None
+        return f"\nCodeNode: {self.type_name}:\n" \
+            f"   {self.code_obj}\n" \
+            f"   Offset: {hex(self.offset)}\n"
 
 
 if __name__ == "__main__":
@@ -4,10 +4,9 @@ Node Processing.
 
 from enum import IntEnum, auto
 from collections import namedtuple
-import tempfile
-import pprint
+from typing import Dict, List, Optional
 
-from ..core import TOK, DIR, LBL, EQU, INST, SEC, STOR
+from ..core import TOK, DIR, LBL, EQU, INST, SEC, STOR, MULT
 from ..core import ExpressionConversion, InstructionSet, InstructionPointer
 from ..core import Reader, BasicLexer, Section, Equate, Label, Labels, Storage
 from ..core import ErrorCode, Error, Instruction, ParserException
@@ -24,10 +23,14 @@ IP = InstructionPointer
 class NodeProcessor(object):
     def __init__(self, reader: Reader):
         self._reader = reader
+        self._filename = reader.filename()
         self._line_no = 0
-        self._code: [CodeNode] = []
-        self._bad: [dict] = []
-        self._sections: [Section] = []
+        self._code: List[CodeNode] = []
+        self._bad: List[dict] = []
+        self._sections: Dict[str, Section] = {}
+        self._ip = IP()
+        self._labels = Labels()
+        self._resolver = Resolver()
 
     def process_EQU(self, tokens: list) -> CodeNode:
         """Process an EQU statement. """
@@ -35,47 +38,52 @@ class NodeProcessor(object):
         # a label followed by the EQU to associate with the label
         if len(tokens) < 2:
             return None
-        if tokens[0][DIR] != 'LABEL':
+        if tokens[0][DIR] != LBL:
             return None
-        if tokens[1][DIR] != 'EQU':
+        if tokens[1][DIR] != EQU:
             return None
         result = Equate(tokens)
         if result:
             result.parse()
             lbl = Label(result.name(), result.value(), constant=True)
-            Labels().add(lbl)
-            return CodeNode(NodeType.EQU, lbl, IP().offset_from_base())
+            self._labels.add(lbl)
+            return CodeNode(NodeType.EQU, lbl, self._ip.offset_from_base())
+        # Only the failure path builds an Error. 'tokens' is the list from
+        # the compound node so the error goes on a node of its own.
         err = Error(ErrorCode.INVALID_LABEL_NAME,
-                    source_file=self._reader.filename,
-                    source_line=int(self._reader.line))
-        tokens["error"] = err
+                    source_file=self._filename,
+                    source_line=self._line_no)
         # _errors.append(err)
-        return CodeNode(NodeType.NODE, tokens, 0)
+        return CodeNode(NodeType.NODE, {DIR: MULT, TOK: tokens, "error": err},
+                        0)
 
     def process_INSTRUCTION(self, node: dict) -> CodeNode:
         ins = None
         if node is None:
             return None
         ins = Instruction(node)
+        offset = self._ip.offset_from_base()
         if ins.parse_result().is_valid():
-            offset = IP().offset_from_base()
             length = len(ins.machine_code())
-            IP().move_relative(length)
+            self._ip.move_relative(length)
             return CodeNode(NodeType.INST, ins, offset, length=length)
         # Instruction is not valid. This could mean either it really is
         # invalid (typo, wrong argument, etc) or that it has a label. To
         # get started, just check to make sure the mnemonic is at least
         # valid.
-        offset = IP().offset_from_base()
         if ins.parse_result().mnemonic_error() is None:
-            ins2 = Resolver().resolve_instruction(ins, IP().location)
+            ins2 = self._resolver.resolve_instruction(ins,
+                                                      self._ip.location)
             if ins2 and ins2.is_valid():
-                IP().move_relative(len(ins2.machine_code()))
+                self._ip.move_relative(len(ins2.machine_code()))
                 return CodeNode(NodeType.INST, ins2, offset)
         if ins and ins.is_valid():
-            IP().move_relative(len(ins.machine_code()))
+            self._ip.move_relative(len(ins.machine_code()))
             return CodeNode(NodeType.INST, ins, offset)
-        # Error, return the errant node
+        # Error, return the errant node. A forward reference still takes up
+        # the room of its instruction so the labels after it get the right
+        # address when pass2 resolves it.
+        self._ip.move_relative(_reserved_length(ins))
         return CodeNode(NodeType.NODE, node, offset)
 
     def process_LABEL(self, node: dict, value=None) -> CodeNode:
@@ -83,15 +91,15 @@ class NodeProcessor(object):
             return None
         if node[DIR] != LBL:
             return None
-        clean = node[TOK].strip("()")
-        existing = Labels()[clean]
+        clean = _strip_label(node[TOK])
+        existing = self._labels[clean]
         if existing:
             return None
         loc = value
         if not value:
-            loc = IP().location
+            loc = self._ip.location
         label = Label(clean, loc)
-        return CodeNode(NodeType.LBL, label, IP().offset_from_base())
+        return CodeNode(NodeType.LBL, label, self._ip.offset_from_base())
 
     def process_SECTION(self, tokens: dict) -> CodeNode:
         if not tokens or (tokens and tokens[0] != SEC):
@@ -99,35 +107,36 @@ class NodeProcessor(object):
         if len(tokens) < 3:
             return None
         try:
-            section = self._find_section(' '.join(tokens))
+            secn = Section(tokens)
         except ParserException:
             return None
-        if section is None:  # not found, create a new one.
-            secn = Section(tokens)
+        name = secn.name()
+        if self._find_section(name) is None:  # not found, add it.
             # print("Processing SECTION")
-            self._sections.append(secn)
+            self._sections[name] = secn
             num_addr, _ = secn.address_range()
-            str_addr = EC().expression_from_decimal(num_addr,
-                                                    "$$")  # 16-bit hex value
-            IP().base_address = str_addr
+            str_addr = EC().string_from_decimal(num_addr,
+                                                "$$")  # 16-bit hex value
+            self._ip.base_address = str_addr
 
             return secn
 
     def process_STORAGE(self, node: dict) -> CodeNode:
         if not node:
             return None
-        offset = IP().offset_from_base()
+        offset = self._ip.offset_from_base()
         sto = Storage(node)
         # print(f"Processing Storage type {sto.storage_type()}")
         # print(f"Storage len = {len(sto)}")
-        IP().move_relative(len(sto))
+        self._ip.move_relative(len(sto))
         return CodeNode(NodeType.STOR, sto, offset)
 
-    def process_node(self, node: dict) -> [CodeNode]:
-        nodes: [CodeNode] = []
+    def process_node(self, node: dict) -> Optional[List[CodeNode]]:
+        nodes: List[CodeNode] = []
         if not is_node_valid(node):
             self._bad.append(node)
             return None
+        self._line_no = node.get('source_line', self._line_no)
         if is_compound_node(node):
             # The MULTIPLE case is when a LABEL is on the same line as some
             # other data like an instruction. In some cases this is common
@@ -137,97 +146,137 @@ class NodeProcessor(object):
             multi = self.process_compound_node(node)
             if not multi:
                 nodes.append(CodeNode(NodeType.NODE, node,
-                             IP().offset_from_base()))
+                             self._ip.offset_from_base()))
             else:
                 nodes.extend(multi)
             return nodes
-        if node[DIR] == SEC:
-            sec = self.process_SECTION(node[TOK])
-            if sec is None:
-                msg = f"Error in parsing section directive. "\
-                    "{self.filename}:{self._line_no}"
-                err = Error(ErrorCode.INVALID_SECTION_POSITION,
-                            supplimental=msg,
-                            source_line=self._line_no)
-                node["error"] = err
-                nodes.append(CodeNode(NodeType.NODE, node, 0))
-            else:
-                # address = sec.address_range()
-                # nodes.append(CodeNode(SEC, sec, address.start))
-                nodes.append(CodeNode(NodeType.SEC, sec, 0))
+        handler = _NODE_HANDLERS.get(node[DIR])
+        if handler is None:
             return nodes
-        # Just check for a label on it's own line.
-        elif node[DIR] == LBL:
-            label = self.process_LABEL(node)
-            Labels().add(label.code_obj)
-            nodes.append(label)
-        # Lastly, if not any of the above, it _might_be an instruction
-        elif node[DIR] == INST:
-            ins = self.process_INSTRUCTION(node)
-            if ins:
-                nodes.append(ins)
-            else:
-                nodes.append(CodeNode(NodeType.NODE, node,
-                                      IP().offset_from_base()))
-        elif node[DIR] == STOR:
-            sto = self.process_STORAGE(node)
-            if sto:
-                nodes.append(sto)
-        return nodes
+        return handler(self, node)
 
-    def process_compound_node(self, node: dict) -> [CodeNode]:
+    def process_compound_node(self,
+                              node: dict) -> Optional[List[CodeNode]]:
         tok_list = node[TOK]
-        nodes: [CodeNode] = []
+        nodes: List[CodeNode] = []
         if len(tok_list) < 2:
             # err = Error(ErrorCode.INVALID_DECLARATION,
             #             source_line=self._line_no)
             return None
         # Record a label unless it's an equate. The equate object (which is
         # similar to a label) handles the storage of both.
-        if tok_list[0][DIR] == LBL and \
-                tok_list[1][DIR] != EQU:
-            clean = tok_list[0][TOK].strip("()")
-            existing = Labels()[clean]
+        kind = tok_list[1][DIR]
+        if tok_list[0][DIR] == LBL and kind != EQU:
+            clean = _strip_label(tok_list[0][TOK])
+            existing = self._labels[clean]
             if not existing:
                 label = self.process_LABEL(tok_list[0])
-                Labels().add(label.code_obj)
+                self._labels.add(label.code_obj)
             else:
                 label = CodeNode(NodeType.LBL, existing,
-                                 IP().offset_from_base())
+                                 self._ip.offset_from_base())
             nodes.append(label)
         # Equate has it's own required label. It's not a standard label
         # in that it can't start with a '.' or end with a ':'
-        if tok_list[1][DIR] == EQU:
+        if kind == EQU:
             equ = self.process_EQU(node[TOK])
             nodes.append(equ)
         # An instruction is allowed to be on the same line as a label.
-        elif tok_list[1][DIR] == INST:
+        elif kind == INST:
             ins = self.process_INSTRUCTION(tok_list[1])
             nodes.append(ins)
         # Storage values can be associated with a label. The label
         # then can be used almost like an EQU label.
-        elif tok_list[1][DIR] == STOR:
+        elif kind == STOR:
             storage = self.process_STORAGE(tok_list[1])
             if storage:
-                # IP().move_location_relative(len(storage.code_obj))
+                # self._ip.move_location_relative(len(storage.code_obj))
                 nodes.append(storage)
                 return nodes
         else:
             nodes.append(CodeNode(NodeType.NODE, node,
-                         IP().offset_from_base()))
+                         self._ip.offset_from_base()))
         return nodes
 
-    def _find_section(self, line: str) -> Section:
-        try:
-            section = Section(line)
-        except ParserException:
-            fname = self._reader.filename()
-            msg = f"Parser exception occured {fname}:{self._line_no}"
-            print(msg)
-            raise ParserException(msg, line_number=self._line_no)
-        else:
-            if section:
-                for _, val in enumerate(self._sections):
-                    if val.name() == section.name():
-                        return section
-            return None
+    # -----=====<  Private Functions  >=====----- #
+
+    def _process_section_node(self, node: dict) -> List[CodeNode]:
+        sec = self.process_SECTION(node[TOK])
+        if sec is None:
+            msg = "Error in parsing section directive. "\
+                f"{self._filename}:{self._line_no}"
+            err = Error(ErrorCode.INVALID_SECTION_POSITION,
+                        supplimental=msg,
+                        source_line=self._line_no)
+            node["error"] = err
+            return [CodeNode(NodeType.NODE, node, 0)]
+        # address = sec.address_range()
+        # return [CodeNode(SEC, sec, address.start)]
+        return [CodeNode(NodeType.SEC, sec, 0)]
+
+    def _process_label_node(self, node: dict) -> List[CodeNode]:
+        # Just check for a label on it's own line.
+        label = self.process_LABEL(node)
+        self._labels.add(label.code_obj)
+        return [label]
+
+    def _process_instruction_node(self, node: dict) -> List[CodeNode]:
+        # If not any of the above, it _might_be an instruction
+        ins = self.process_INSTRUCTION(node)
+        if ins:
+            return [ins]
+        return [CodeNode(NodeType.NODE, node, self._ip.offset_from_base())]
+
+    def _process_storage_node(self, node: dict) -> List[CodeNode]:
+        sto = self.process_STORAGE(node)
+        if sto:
+            return [sto]
+        return []
+
+    def _find_section(self, name: str) -> Optional[Section]:
+        return self._sections.get(name)
+
+
+# What a label can stand for in an operand, as named in the instruction set.
+_LABEL_PLACEHOLDERS = ("a16", "d16", "r8", "a8", "d8")
+
+# Built once at import rather than per NodeProcessor instance.
+_NODE_HANDLERS = {SEC: NodeProcessor._process_section_node,
+                  LBL: NodeProcessor._process_label_node,
+                  INST: NodeProcessor._process_instruction_node,
+                  STOR: NodeProcessor._process_storage_node}
+
+
+def _reserved_length(ins: Instruction) -> int:
+    """
+    Returns the size of an instruction whose operand is a label that isn't
+    defined yet. The label is swapped for each address or value placeholder
+    until the flat opcode table has a match, and that opcode's length is
+    the room the instruction takes.
+    """
+    if ins is None:
+        return 0
+    unresolved = ins.parse_result().unresolved()
+    mnemonic = ins.mnemonic()
+    if not unresolved or not mnemonic:
+        return 0
+    operands = list(ins.operands())[:2]
+    operands += [None] * (2 - len(operands))
+    ins_set = IS()
+    for placeholder in _LABEL_PLACEHOLDERS:
+        op1, op2 = (op.replace(unresolved, placeholder) if op else op
+                    for op in operands)
+        opcode = ins_set.instruction_from_operands(mnemonic, op1, op2)
+        if opcode is not None:
+            byte = EC().string_from_decimal(opcode, "$")
+            return ins_set.instruction_detail_from_byte(byte)["length"]
+    return 0
+
+
+def _strip_label(text: str) -> str:
+    """Removes the parens that may surround a label reference."""
+    if text[:1] == "(":
+        text = text[1:]
+    if text[-1:] == ")":
+        text = text[:-1]
+    return text
@@ -3,21 +3,21 @@ This class (and accompanying functions) try to resolve labels assigned to
 variable type values. Instructions that cannot be resolved are returned in
 original state.
 """
-import operator
+import logging
 from singleton_decorator import singleton
 
-from ..core.lexer_results import LexerTokens, LexerResults
+from ..lexer.lexer_results import LexerTokens, LexerResults
 from ..core.conversions import ExpressionConversion as EC
-from ..core.instruction_pointer import InstructionPointer as IP
-from ..core.instruction import Instruction
+from ..instructions.instruction_pointer import InstructionPointer as IP
+from ..instructions.instruction import Instruction
 from ..core.label import Label, Labels, LabelScope, LabelUtils
-from ..core.registers import Registers
+
+_LOG = logging.getLogger(__name__)
 
 
 @singleton
 class Resolver():
     """ Represents the entire Z80 instruction set """
-    _jump_table = None
 
     def resolve_instruction(self,
                             instruction: Instruction,
@@ -30,27 +30,15 @@ class Resolver():
         returned.  current_address is used to compute relative offsets
         given a label with an absolute position.
         """
-        if self._jump_table is None:
-            self._jump_table = {
-                "ADD": op_add,
-                "CALL": op_call,
-                "JP": op_jp,
-                "JR": op_jr,
-                "LD": op_ld,
-                "LDH": op_ldh,
-            }
         if current_address < 0 or current_address > 65535:
             return instruction
         lex: LexerResults = instruction.parse_result()
         if lex and lex.mnemonic_error() is None:
-            base = lex.mnemonic()
-            if base not in self._jump_table:
+            opcode_func = _JUMP_TABLE.get(lex.mnemonic())
+            if opcode_func is None:
                 return instruction
-
-            opcode_func = self._jump_table[base]
-            if opcode_func:
-                resolved = opcode_func(lex)
-                return resolved if not None else instruction
+            resolved = opcode_func(lex)
+            return resolved if resolved is not None else instruction
         return instruction
 
     @staticmethod
@@ -71,15 +59,17 @@ opcode_handler function contains the table to jump to each function
 based upon the starting mneumonic.
 """
 
+# Labels is a singleton so it and its lookup can be bound once.
+_LABELS = Labels()
+_LABEL_GET = _LABELS.__getitem__
+
 
 def maybe_label(text: str) -> Label:
     """
     Returns the Label object is the text string is the key to a Label
     object, otherwise None.
     """
-    maybe = text.strip()
-    label: Label = Labels()[maybe]
-    return None if label is None else label
+    return _LABEL_GET(text.strip())
 
 
 def format_with_parens(val: str, parens: bool):
@@ -88,6 +78,16 @@ def format_with_parens(val: str, parens: bool):
     return val
 
 
+def _strip_parens(text: str) -> tuple:
+    """
+    Returns the text without its surrounding parens and True if any were
+    removed.
+    """
+    if text[:1] != "(" and text[-1:] != ")":
+        return text, False
+    return text.strip("()"), True
+
+
 def op_add(lex: LexerResults) -> Instruction:
     """ Process ADD instructions """
     return None
@@ -95,12 +95,30 @@ def op_add(lex: LexerResults) -> Instruction:
 
 def op_call(lex: LexerResults) -> Instruction:
     """ Process CALL instructions """
-    return None
+    return _resolve_address("CALL", lex)
 
 
 def op_jp(lex: LexerResults) -> Instruction:
     """ Process JP instructions """
-    return None
+    return _resolve_address("JP", lex)
+
+
+def _resolve_address(mnemonic: str, lex: LexerResults) -> Instruction:
+    """
+    Resolves the label of an absolute jump or call. The label is always the
+    last operand; an operand before it is the condition.
+    """
+    args = [op for op in (lex.operand1(), lex.operand2()) if op]
+    if not args:
+        return None
+    label = maybe_label(args[-1])
+    if label is None:
+        return None
+    # Always 16-bits since the operand is an a16 address.
+    args[-1] = EC().string_from_decimal(label.value(), "$$")
+    ins = Instruction.from_string(f"{mnemonic} {', '.join(args)}")
+    ins.labels = [label]
+    return ins
 
 
 def op_jr(lex: LexerResults) -> Instruction:
@@ -108,38 +126,36 @@ def op_jr(lex: LexerResults) -> Instruction:
     args = []
     clean_label = None
     # Must be at least one operand.
-    loc = IP().offset_from_base()
-    curr = IP().location
-    curr += 2
-    if lex.operand1 is None:
+    ip = IP()
+    ec = EC()
+    # Relative jumps count from the end of the two byte instruction.
+    curr = ip.location + 2
+    if lex.operand1() is None:
         return None
-    clean1 = lex.operand1().strip("()")
-    paren1 = len(clean1) < len(lex.operand1())
+    clean1, paren1 = _strip_parens(lex.operand1())
     clean2 = None
     paren2 = False
     if lex.operand2():
-        clean2 = lex.operand2().strip("()")
-        paren2 = len(clean2) < len(lex.operand2())
+        clean2, paren2 = _strip_parens(lex.operand2())
     if lex.operand1_error():
         label = maybe_label(clean1)
         if label is None:
-            tmp = Instruction.from_string("JR $00")
-            tmp.is_valid = False
             return None
         clean_label = label
-        print(f"RESOLVE JR compute relative IP = {hex(IP().location)}")
-        print(f"from = {hex(label.value())}")
         base = label.value()
         rel = compute_relative(curr, base)
-        print(f"Relative value is {rel}")
-        rel = EC().expression_from_decimal(rel, "$")
+        if rel is None:
+            return None
+        _LOG.debug("RESOLVE JR compute relative IP = %#x from = %#x, "
+                   "relative value is %s", ip.location, base, rel)
+        rel = ec.string_from_decimal(rel, "$")
         args.append(format_with_parens(rel, paren1))
         lex.clear_operand1_error()
     else:
         if lex.operand1() in ["NZ", "Z", "NC", "C"]:
             args.append(lex.operand1())
         else:
-            val = EC().decimal_from_expression(clean1)
+            val = ec.decimal_from_expression(clean1)
             if val:
                 args.append(val)
             else:
@@ -150,25 +166,15 @@ def op_jr(lex: LexerResults) -> Instruction:
         if label is None:
             return None
         clean_label = label
-        rel = compute_relative(IP().location, label.value())
-        #
-        # JR NZ, 0x?? is two bytes in size. For negative values (0x80+)
-        # reduce the relative by two bytes to account for going back
-        # INCLUDING the instruction size. For anything less than 80,
-        # we add two to include the instruction size. This will give a
-        # range of -126 through +129.
-        #
-        if rel > 0x80:
-            rel -= 2
-        else:
-            rel += 2
-
-        val = EC().expression_from_decimal(rel, "$")
+        rel = compute_relative(curr, label.value())
+        if rel is None:
+            return None
+        val = ec.string_from_decimal(rel, "$")
         args.append(format_with_parens(val, paren2))
         lex.clear_operand2_error()
     else:
         if lex.operand2():
-            val = EC().decimal_from_expression(clean2)
+            val = ec.decimal_from_expression(clean2)
             if val:
                 args.append(format_with_parens(val, paren2))
                 lex.clear_operand2_error()
@@ -184,51 +190,22 @@ def op_jr(lex: LexerResults) -> Instruction:
 
 
 def op_ld(lex: LexerResults) -> Instruction:
-    args: list = []
-    clean_labels = []
-    if lex.operand1() is None or lex.operand2() is None:
+    """ Process LD instructions """
+    operands = (lex.operand1(), lex.operand2())
+    if None in operands:
         return None
-    paren1 = paren2 = False
-    clean1 = clean2 = None
-    if lex.operand1_error():
-        clean1 = lex.operand1().strip("()")
-        paren1 = len(clean1) < len(lex.operand1())
-        label = maybe_label(clean1)
-        if label is None:
-            if Registers().is_valid_register(clean1) is False:
-                return None
-        clean_labels.append(label)
-        val = EC().expression_from_decimal(label.value(), "$")
-        args.append(format_with_parens(val, paren1))
-    else:
-        args.append(lex.operand1())
-
-    if lex.operand2_error():
-        clean2 = lex.operand2().strip("()")
-        paren2 = len(clean2) < len(lex.operand2())
-        label = maybe_label(clean2)
-        if label is None:
-            # Not a label but is it a number?
-            val = EC().decimal_from_expression(clean2)
-            if val:
-                args.append(format_with_parens(val, paren2))
-            else:
-                # If not a number, is this a valid register?
-                # We test this here since if operand1 is in error, operand2
-                # (if it exists) will also be in error.
-                if Registers().is_valid_register(clean2) is False:
-                    return None
-                args.append(format_with_parens(clean2, paren2))
-        else:
-            val = EC().expression_from_decimal(label.value(), "$")
-            args.append(format_with_parens(val, paren2))
-            clean_labels.append(label)
-    else:
-        args.append(lex.operand2())
-
-    text = f"LD {args[0]}, {args[1]}"
-    ins = Instruction.from_string(text)
-    ins.labels = clean_labels
+    # Only the operands that failed to parse can hold a label. Every label
+    # in them is replaced in one pass.
+    errors = (lex.operand1_error(), lex.operand2_error())
+    args = [_LABELS.substitute_all(op) if err else op
+            for op, err in zip(operands, errors)]
+    if args == list(operands):
+        return None
+    ins = Instruction.from_string(f"LD {args[0]}, {args[1]}")
+    ins.labels = [label for label in
+                  (maybe_label(_strip_parens(op)[0])
+                   for op, err in zip(operands, errors) if err)
+                  if label is not None]
     return ins
 
 
@@ -236,14 +213,23 @@ def op_ldh(lex: LexerResults) -> Instruction:
     return None
 
 
+# The mnemonics that may need resolving and the function that handles each.
+# Stubs such as op_ldh are left out until they resolve something; an
+# instruction without an entry is returned unchanged.
+_JUMP_TABLE = {
+    "ADD": op_add,
+    "CALL": op_call,
+    "JP": op_jp,
+    "JR": op_jr,
+    "LD": op_ld,
+}
+
+
 def compute_relative(curr, base) -> int:
     """
-    Compute a relative 8-bit value
+    Compute the relative 8-bit distance from curr to base
     """
-    if curr > base:
-        rel = base - curr
-    else:
-        rel = curr - base
+    rel = base - curr
 
     if rel < -128 or rel > 127:
         return None
@@ -264,6 +250,6 @@ def twos_comp(val, bits=8) -> int:
 
 def ones_comp(val, bits=8) -> int:
     if val < 0:
-        mask = (2**bits) - 1
-        return operator.xor(abs(val), mask)
+        mask = (1 << bits) - 1
+        return abs(val) ^ mask
     return val
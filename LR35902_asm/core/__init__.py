@@ -25,17 +25,27 @@ from .registers import Registers
 from .expression import Expression, ExpressionType
 # from .tokens import Token, TokenGroup, Tokenizer
 
+# Re-exported from the sibling packages.
+from ..instructions.instruction_set import InstructionSet
+from ..instructions.instruction_pointer import InstructionPointer
+from ..instructions.instruction import Instruction
+from ..lexer.lexer_parser import BasicLexer, is_node_valid, is_compound_node
+from ..lexer.lexer_results import LexerResults, LexerTokens
+from ..lexer.lexical_analyzer import LexicalAnalyzer
+
 __all__ = [
     "Reader", "BufferReader", "FileReader", "ExpressionConversion",
     "NodeType", "NODE", "NODE_TYPES", "DIRECTIVES", "STORAGE_DIRECTIVES",
     "DIR", "TOK", "EQU", "LBL", "INST", "STOR", "SEC", "MULT", "ARGS", "PARM",
     "BaseDescriptor", "DEC_DSC", "HEX_DSC", "HEX16_DSC", "BIN_DSC", "LBL_DSC",
     "OCT_DSC", "MinMax", "AddressType", "NodeDefinition", "Label", "Labels",
-    "LabelUtils", "LabelScope", "Label", "Labels", "LabelUtils", "LabelScope",
+    "LabelUtils", "LabelScope",
     "Symbol", "Symbols", "SymbolUtils", "SymbolScope", "Equate",
     "BuildRunner", "BuildRunnerData", "ParserException", "DefineDataError",
     "SectionDeclarationError", "SectionTypeError", "ErrorCode", "Error",
     "ExpressionBoundsError", "ExpressionSyntaxError", "Storage",
     "StorageType", "Section", "SectionAddress", "SectionType", "Registers",
-    "Expression", "ExpressionType"
+    "Expression", "ExpressionType", "InstructionSet", "InstructionPointer",
+    "Instruction", "BasicLexer", "is_node_valid", "is_compound_node",
+    "LexerResults", "LexerTokens", "LexicalAnalyzer"
 ]
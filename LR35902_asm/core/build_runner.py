@@ -13,7 +13,7 @@ compilation process as far as addresses are concerned. This means:
 from dataclasses import dataclass
 from singleton_decorator import singleton
 from .symbol import Symbol, SymbolScope, Symbols
-from .instruction_pointer import InstructionPointer
+from ..instructions.instruction_pointer import InstructionPointer
 from .section import Section
 
 
@@ -1,39 +1,43 @@
 """Commonly used constants."""
 
 import string
+import sys
 from enum import IntEnum, Enum, auto
 from dataclasses import dataclass
 from collections import namedtuple
 
-# Token element names
-ARGS = "arguments"
-BAD = "invalid"
-DIR = "directive"
-PARM = "parameters"
-REMN = "remainder"
-TOK = "tokens"
-TELM = "telemetry"  # Location specific information
-NODE = "node"  # Rpresents an internal tokenized node.
+# Token element names. These are interned so that comparing a node's
+# directive against them is a pointer compare.
+ARGS = sys.intern("arguments")
+BAD = sys.intern("invalid")
+DIR = sys.intern("directive")
+PARM = sys.intern("parameters")
+REMN = sys.intern("remainder")
+TOK = sys.intern("tokens")
+TELM = sys.intern("telemetry")  # Location specific information
+NODE = sys.intern("node")  # Rpresents an internal tokenized node.
 
 
 #  Code-level element names
-DEF = "DEFINE"
-EQU = "EQU"
-INST = "INSTRUCTION"
-LBL = "LABEL"
-MULT = "MULTIPLE"
-ORG = "ORIGIN"
-SEC = "SECTION"
-STOR = "STORAGE"
-SYM = "SYMBOL"
+DEF = sys.intern("DEFINE")
+EQU = sys.intern("EQU")
+INST = sys.intern("INSTRUCTION")
+LBL = sys.intern("LABEL")
+MULT = sys.intern("MULTIPLE")
+ORG = sys.intern("ORIGIN")
+SEC = sys.intern("SECTION")
+STOR = sys.intern("STORAGE")
+SYM = sys.intern("SYMBOL")
 
 
 LOGGER_FORMAT = '[%(levelname)s] %(asctime)s - %(message)s'
 
-DIRECTIVES = [
+# Directives and storage directives are only ever used for membership
+# tests so they are kept as frozensets.
+DIRECTIVES = frozenset([
     "DB",  # Storage
     "DEF",
-    "DL"   # Storage
+    "DL",  # Storage
     "DS",  # Storage
     "DW",  # Storage
     "ENDM",
@@ -50,9 +54,14 @@ DIRECTIVES = [
     "SECTION",
     "SET",
     "UNION",
-]
+])
 
-STORAGE_DIRECTIVES = ["DS", "DB", "DW", "DL"]
+STORAGE_DIRECTIVES = frozenset(["DS", "DB", "DW", "DL"])
+
+# Maps the first token of a line to the directive it produces. Storage
+# directives are all grouped under STOR.
+DIRECTIVE_TYPES = {name: sys.intern(name) for name in DIRECTIVES}
+DIRECTIVE_TYPES.update({name: STOR for name in STORAGE_DIRECTIVES})
 
 #
 # Bracketing is also done by " and ' which is why they are part of
@@ -1,6 +1,7 @@
 """Convert an Expression to/from decimal (unless it's a character type)."""
 
 import string
+from functools import lru_cache
 from singleton_decorator import singleton
 from collections import namedtuple
 
@@ -8,6 +9,19 @@ from .expression import ExpressionType, Expression
 
 ECMinMax = namedtuple('ECMinMax', ['min', 'max'])
 
+# Digit count limits for each expression type.
+_HEX_LEN = ECMinMax(1, 10)
+_DEC_LEN = ECMinMax(1, 10)
+_BIN_LEN = ECMinMax(1, 16)
+_OCT_LEN = ECMinMax(1, 5)
+
+# Every 8-bit value as a hex expression. Most converted values are bytes.
+_HEX2 = tuple(f"${i:02x}" for i in range(256))
+# Every binary literal of up to 8 digits, leading zeros included, mapped to
+# its value.
+_BIN8 = {f"{i:0{width}b}": i
+         for width in range(1, 9) for i in range(1 << width)}
+
 
 @singleton
 class ExpressionConversion():
@@ -35,6 +49,17 @@ class ExpressionConversion():
             '&': self._oct_to_dec,
             '0x': self._hex_to_dec
         }
+        # Every string prefix is identified by its first character. '0x'
+        # shares the decimal converter, which rejects the 'x'. A plain
+        # decimal without the leading '0' starts with any other digit.
+        self._to_dec_by_char = {
+            '$': self._hex_to_dec,
+            '0': self._dec,
+            '%': self._bin_to_dec,
+            '&': self._oct_to_dec,
+        }
+        self._to_dec_by_char.update(dict.fromkeys("123456789",
+                                                  self._plain_dec))
         self._from_dec = {
             '$': self._dec_to_hex,
             '$$': self._dec_to_hex16,
@@ -43,9 +68,9 @@ class ExpressionConversion():
             '&': self._dec_to_oct,
             '0x': self._dec_to_hex
         }
-        self._8_bit_registers = ['B', 'C', 'D', 'E', 'H', 'L', 'A']
-        self._16_bit_registers = ['BC', 'DE', 'HL', 'F', 'PC', 'SP']
-        self._internal_type: ExpressionType = ExpressionType.INVALID
+        self._8_bit_registers = frozenset(['B', 'C', 'D', 'E', 'H', 'L', 'A'])
+        self._16_bit_registers = frozenset(['BC', 'DE', 'HL', 'F', 'PC', 'SP'])
+        self._registers = self._8_bit_registers | self._16_bit_registers
 
     def expression_from_decimal(self,
                                 dec_value,
@@ -55,16 +80,25 @@ class ExpressionConversion():
         expression_prefix -- This represents the data type to convert the
         provided decimal value to.
         """
-        try:
-            dec_value = dec_value + 0  # Ensure that this is a numeric value
-        except TypeError:
+        if not isinstance(dec_value, int):  # Must be a numeric value
             return None
 
-        if expression_prefix in self._from_dec:
-            conv = self._from_dec[expression_prefix]
+        conv = self._from_dec.get(expression_prefix)
+        if conv:
             return Expression(conv(dec_value))
         return ""
 
+    def string_from_decimal(self, dec_value, expression_prefix) -> str:
+        """Return the decimal value as the text of an expression.
+
+        This is the same conversion as expression_from_decimal without
+        wrapping the result in an Expression, for use in source text.
+        """
+        if not isinstance(dec_value, int):  # Must be a numeric value
+            return None
+        conv = self._from_dec.get(expression_prefix)
+        return conv(dec_value) if conv else None
+
     def decimal_from_expression(self, expression: Expression):
         """Convert a given expression to it's decimal equivalent.
 
@@ -81,9 +115,10 @@ class ExpressionConversion():
         """
         if not expression:
             return None
+        if isinstance(expression, str):
+            return _decimal_from_string(expression)
 
-        key = expression.prefix
-        conv = None if key not in self._to_dec else self._to_dec[key]
+        conv = self._to_dec.get(expression.prefix)
         if conv and expression.type is not ExpressionType.CHARACTER:
             return conv(expression)
         return None
@@ -117,29 +152,25 @@ class ExpressionConversion():
     def _hex_to_dec(self, val):
         """Convert a hexidecimal number ($12, $1234) into a decimal value."""
         hexi = "0123456789ABCDEF"
-        if not self._validate_expression(val, '$', ECMinMax(1, 10), hexi):
+        if not self._validate_expression(val, '$', _HEX_LEN, hexi):
             return None
-        self._internal_type = ExpressionType.HEXIDECIMAL
         return int(val[1:], 16)
 
     def _dec_to_hex(self, val, digits=2):
         """Convert a decimal value into it's hexidecimal equivalent."""
-        try:
-            clean = val + 0
-        except TypeError:
+        if not isinstance(val, int):
             return None
+        clean = val
         # Validate ranges
-        if digits not in [2, 4]:
+        if digits != 2 and digits != 4:
             digits = 2
         clean = max(clean, 0)
+        if digits == 2 and clean <= 255:
+            return _HEX2[clean]
         if clean > 255:
             digits = 4
-        if clean >= 16 ** digits:
-            clean = (16 ** digits) - 1
-        hex_str = hex(clean)[2:]
-        padded = "$" + hex_str.zfill(digits)
-        self._internal_type = ExpressionType.DECIMAL
-        return padded
+        clean = min(clean, (1 << (4 * digits)) - 1)
+        return f"${clean:0{digits}x}"
 
     def _dec_to_hex16(self, val):
         """Return a decimal value into it's 16-bit decimal equivalent."""
@@ -147,13 +178,17 @@ class ExpressionConversion():
 
     def _dec(self, val):
         """Validate and return the value as a decimal number."""
-        if not self._validate_expression(val,
-                                         '0',
-                                         ECMinMax(1, 10), "0123456789"):
+        if val == "0":  # The '0' is both the prefix and the value.
+            return 0
+        if not self._validate_expression(val, '0', _DEC_LEN, "0123456789"):
             return None
 
         return int(val[1:], 10)
 
+    def _plain_dec(self, val):
+        """Return a decimal number written without the leading '0'."""
+        return self._dec("0" + val)
+
     def _dec_to_dec(self, val):
         """Convert dec val to string with a leading 0.
 
@@ -166,7 +201,6 @@ class ExpressionConversion():
             clean = max(0, min(65535, val))
         except TypeError:
             return None
-        self._internal_type = ExpressionType.DECIMAL
         return "0" + str(clean)
 
     def _bin_to_dec(self, val):
@@ -175,10 +209,13 @@ class ExpressionConversion():
         Validate the binary value and return as a decimal number.
         The binary value (%1001) can be from 1 bit to a max of 16 bits.
         """
-        if not self._validate_expression(val, '%', ECMinMax(1, 16), "01"):
+        if val[:1] == '%':
+            byte = _BIN8.get(val[1:])
+            if byte is not None:
+                return byte
+        if not self._validate_expression(val, '%', _BIN_LEN, "01"):
             return None
 
-        self._internal_type = ExpressionType.BINARY
         return int(val[1:], 2)
 
     def _dec_to_bin(self, val) -> str:
@@ -188,8 +225,7 @@ class ExpressionConversion():
         Returns a 0 if < 0, 65535 if > 65535
         """
         clean = max(0, min(65535, val))
-        self._internal_type = ExpressionType.BINARY
-        return '%' + bin(clean)[2:]
+        return f"%{clean:b}"
 
     def _oct_to_dec(self, val):
         """Convert the octal value to it's Decimalequivalent.
@@ -197,9 +233,8 @@ class ExpressionConversion():
         Validate the octal value and return as a decimal number.
         The binary value (%1001) can be from 1 bit to a max of 16 bits.
         """
-        if not self._validate_expression(val, '&', (1, 5), "01234567"):
+        if not self._validate_expression(val, '&', _OCT_LEN, "01234567"):
             return None
-        self._internal_type = ExpressionType.DECIMAL
         return int(val[1:], 8)
 
     def _dec_to_oct(self, val):
@@ -208,8 +243,7 @@ class ExpressionConversion():
             clean = max(0, min(65535, val))
         except TypeError:
             return None
-        self._internal_type = ExpressionType.OCTAL
-        return '&' + oct(clean)[2:]
+        return f"&{clean:o}"
 
     def _validate_expression(self, exp, key, minmax: ECMinMax, chrset):
         mini = minmax.min
@@ -221,10 +255,8 @@ class ExpressionConversion():
         if len(val) < mini or len(val) > maxi:
             return False
 
-        for char in val:
-            if char.upper() not in chrset:
-                return False
-        return True
+        # Deleting every allowed character must leave nothing behind.
+        return not val.translate(_delete_table(chrset))
 
     def _is_hex(self, expression):
         if expression:
@@ -248,13 +280,27 @@ class ExpressionConversion():
     #
 
     def _is_register(self, expression):
-        is_reg = False
-        if expression:
-            upcase = expression.upper()
-            if upcase in self._8_bit_registers:
-                is_reg = True
-            elif upcase in self._16_bit_registers:
-                is_reg = True
-        return is_reg
+        return bool(expression) and expression.upper() in self._registers
 
 # End of class ExpressionConversion #
+
+
+# The converters are pure so the singleton's table is bound once.
+_TO_DEC_BY_CHAR = ExpressionConversion()._to_dec_by_char
+
+
+@lru_cache(maxsize=4096)
+def _decimal_from_string(text: str):
+    """
+    Converts a raw expression string to decimal. Source files reuse a small
+    set of literals so the results are memoized.
+    """
+    conv = _TO_DEC_BY_CHAR.get(text[0])
+    return conv(text) if conv else None
+
+
+@lru_cache(maxsize=None)
+def _delete_table(chrset: str) -> dict:
+    """Returns a translate table that deletes the characters in chrset
+    in either case."""
+    return str.maketrans('', '', chrset + chrset.lower())
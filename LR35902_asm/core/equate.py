@@ -1,13 +1,28 @@
 """
 Manages EQU tokens
 """
+import re
 import string
+from typing import List
 from .label import Label
 from .conversions import ExpressionConversion
 from .constants import TOK, DIR, LBL, EQU
 from ..lexer.lexer_parser import BasicLexer
 
 EC = ExpressionConversion
+# The converter is a singleton so one instance is kept for every call.
+_EC = EC()
+# Deletes every character allowed in an EQU label. Anything left over
+# makes the label invalid.
+_LABEL_DELETE = str.maketrans('', '', string.ascii_letters + "_")
+# A complete "LABEL EQU value" line with an optional trailing comment.
+_EQU_RE = re.compile(r"\s*([A-Za-z_]+)\s+EQU\s+([^\s;]+)\s*(?:;.*)?$",
+                     re.IGNORECASE)
+# Every plain EQU line in a whole source buffer. The same line shape as
+# _EQU_RE so both accept exactly the same lines.
+_EQU_ALL_RE = re.compile(r"^[ \t]*([A-Za-z_]+)[ \t]+EQU[ \t]+([^\s;]+)"
+                         r"[ \t]*(?:;.*)?$",
+                         re.IGNORECASE | re.MULTILINE)
 # TOK = const.TOK
 # DIR = const.DIR
 # LBL = const.LBL
@@ -27,14 +42,12 @@ class Equate:
     def __str__(self):
         """Return a string representatio n of this Equate object."""
         if self._label:
-            desc = f"{self._label.name()} = {hex(self._label.value())}\n"
-            return desc
+            return f"{self._label.name()} = {hex(self._label.value())}\n"
         return None
 
     def __repr__(self):
         """Return a string respresendation of how the object was created."""
-        desc = f"Equate({self._tok})"
-        return desc
+        return f"Equate({self._tok})"
 
     @staticmethod
     def typename():
@@ -45,12 +58,26 @@ class Equate:
     def from_string(cls, line: str):
         """Create a new Equate object from a string."""
         if line:
+            # A plain EQU line is split directly without running the lexer.
+            match = _EQU_RE.match(line.upper())
+            if match:
+                return cls([{DIR: LBL, TOK: match.group(1)},
+                            {DIR: EQU, TOK: [EQU, match.group(2)]}])
             tok = BasicLexer.from_string(line)
             if tok:
-                tok.tokenize()
-                return cls(tok.tokenized_list())
+                return cls(tok.tokenize())
         return cls({})
 
+    @classmethod
+    def parse_all(cls, text: str) -> List[Label]:
+        """Return a Label for every valid plain EQU line in 'text'."""
+        labels = []
+        for name, value in _EQU_ALL_RE.findall(text.upper()):
+            label = _label_from(name, value)
+            if label:
+                labels.append(label)
+        return labels
+
     def parse(self):
         """Parse the current Equate definition."""
         self._label = _EquateParser(self._tok).parse()
@@ -87,7 +114,7 @@ class _EquateParser:
         self._tok = tokens
 
     def parse(self) -> dict:
-        if self._tok is None:
+        if not self._tok:
             return None
         return self.validate()
 
@@ -106,18 +133,22 @@ class _EquateParser:
             return None
         if len(self._tok) < 2:
             return None
-        label_name = self._tok[0][TOK]
-        # keys are correct. Now capture/validate values.
+        # keys are correct. Now capture/validate values. The value must be
+        # a single expression, as in _EQU_RE, not the start of a longer one.
         equ = self._tok[1][TOK]
-        equ_val = equ[1]
-        valid = string.ascii_letters + "_"
-        for char in label_name:
-            if char not in valid:
-                return None
-        val = EC().decimal_from_expression(equ_val)
-        if val:
-            return Label(label_name, val, constant=True)
+        if len(equ) != 2:
+            return None
+        return _label_from(self._tok[0][TOK], equ[1])
+
+
+def _label_from(label_name: str, equ_val: str) -> Label:
+    """Return a constant Label for a validated EQU name and value."""
+    if label_name.translate(_LABEL_DELETE):
         return None
+    val = _EC.decimal_from_expression(equ_val)
+    if val:
+        return Label(label_name, val, constant=True)
+    return None
 
 
 if __name__ == "__main__":
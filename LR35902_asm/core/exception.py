@@ -153,16 +153,28 @@ class Error:
         self._file = source_file
         self._line = source_line
 
+    def __str__(self):
+        return self.format()
+
     def __repr__(self):
-        if self._code in Error.__messages:
-            message = Error.__messages[self._code]
-            if self._supplimental:
-                message += ": [" + self._supplimental + "]"
-            if self._file:
-                line = str(self._line) if not None else "?"
-                message += f"\nLocation: {self._file}:{line}\n"
-        else:
-            message = f"ERROR: Invalid error code: [{self._code}]"
+        """Return a str representation of how to re-construct this object."""
+        code = getattr(self._code, "name", self._code)
+        return f"Error(ErrorCode.{code}, {self._supplimental!r})"
+
+    def format(self) -> str:
+        """
+        Return the full error message for reporting. The message is only
+        built here so that creating an Error, which happens on every failed
+        operand match, stays cheap.
+        """
+        message = Error.__messages.get(self._code)
+        if message is None:
+            return f"ERROR: Invalid error code: [{self._code}]"
+        if self._supplimental:
+            message += ": [" + self._supplimental + "]"
+        if self._file:
+            line = str(self._line) if self._line is not None else "?"
+            message += f"\nLocation: {self._file}:{line}\n"
         return message
 
     @property
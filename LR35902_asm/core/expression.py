@@ -55,6 +55,12 @@ class Expression():
         desc += f"Orignal: [{self._raw_value}]"
         return desc
 
+    def to_decimal(self) -> int:
+        """Return the decimal value, or None for a CHARACTER expression."""
+        if self._type is ExpressionType.CHARACTER:
+            return None
+        return int(self._value, self._value_descr.args.base)
+
     def _get_prefix(self) -> str:
         _prefixes = ["0x", "0", "$$", "$", "&", "%", "'", '"']
         _key = [x for idx, x
@@ -133,23 +139,23 @@ class Expression():
 
         # Validate that the key passed is equal to the key of the expression.
         # (i.e. key of "$" is valud with an expression of "$1000".
-        self._try_key_length()
+        self._try_key_length(self._prefix, expr)
 
         # value_base of 0 indicates a CHARACTER (string) expression.
-        if descr.base == 0:
-            self._try_str_term()
+        if descr.args.base == 0:
+            self._try_str_term(self._prefix, expr)
             # Drop trailing term char.
             raw = expr[len(self._prefix):len(expr)-1]
 
         # If any characters are NOT in the allowed charactset, fail.
-        self._try_in_charset(descr)
+        self._try_in_charset(raw, expr, descr)
 
         # Our range is inclusive of the max whereas the Python range()
         # is exclusive. The +1 over the limit accounts for this.
         self._try_len_range(descr)
 
         # LBL_DSC has a base of 0 so don't check min/max value here.
-        if descr.value_base > 0:
+        if descr.args.base > 0:
             self._try_val_range(raw, expr, descr)
         return raw
 
@@ -159,14 +165,14 @@ class Expression():
     #
     def _try_len_range(self, descr: BaseDescriptor):
         raw = self._raw_value[len(self._prefix):]
-        if len(raw) not in range(descr.limits.min,
-                                 descr.limits.max+1):
+        if len(raw) not in range(descr.args.chars.min,
+                                 descr.args.chars.max+1):
             msg = f"Expression length is outside predefined bounds: [{raw}]"
             raise ExpressionBoundsError(msg)
 
     def _try_val_range(self, raw: str, expr: str, descr: BaseDescriptor):
-        num = int(raw, descr.base)
-        if descr.limits.min > num > descr.limits.max:
+        num = int(raw, descr.args.base)
+        if not descr.args.limits.min <= num <= descr.args.limits.max:
             msg = "Expression value is outside predefined bounds: "
             msg += f"[{expr}]"
             raise ExpressionBoundsError(msg)
@@ -1,11 +1,22 @@
 """Label Handling classes."""
 
 
+import re
 import string
 from singleton_decorator import singleton
 from enum import IntEnum
 
 from .constants import LBL, DIRECTIVES
+from .conversions import ExpressionConversion
+
+# The converter is a singleton so one instance is kept for every call.
+_EC = ExpressionConversion()
+
+# Sets of the characters allowed in a label name for O(1) membership.
+_FIRST_CHARS = frozenset(string.ascii_letters + ".")
+_VALID_CHARS = frozenset(string.ascii_letters + string.digits + ".:_")
+# Deletes every valid label character. Anything left over is invalid.
+_INVALID_CHARS_TR = str.maketrans('', '', ''.join(_VALID_CHARS))
 
 
 class LabelScope(IntEnum):
@@ -17,6 +28,8 @@ class LabelScope(IntEnum):
 
 class Label(object):
     """Represents a label which is used to represent an address or constant."""
+    __slots__ = ("_constant", "_scope", "_original_label", "_clean_label",
+                 "_value", "_base_address", "_local_hash")
 
     def __init__(self, name: str, value: int, constant: bool = False):
         """Initialize a new Label object."""
@@ -40,7 +53,7 @@ class Label(object):
             to the current identified SECTION as reported by the
             InstructionPointer object.
         """
-        from instruction_pointer import InstructionPointer
+        from ..instructions.instruction_pointer import InstructionPointer
         if not name:
             raise ValueError(name)
 
@@ -142,7 +155,7 @@ class Label(object):
         self._base_address = new_value
 
     def _scope_and_validate(self, name: str) -> LabelScope:
-        valid = (name[0].isalpha or name[0] == ".") \
+        valid = name[0] in _FIRST_CHARS \
             and LabelUtils.name_valid_label_chars(name)
         self._scope = None
 
@@ -162,7 +175,7 @@ class Label(object):
                 self._scope = LabelScope.GLOBAL
 
         if valid:
-            from .instruction_set import InstructionSet
+            from ..instructions.instruction_set import InstructionSet
             clean = name.replace(":", "").replace(".", "").upper()
             valid = clean not in DIRECTIVES
             valid = False if InstructionSet().is_mnemonic(clean) else True
@@ -185,24 +198,17 @@ class LabelUtils():
 
     @classmethod
     def valid_label_chars(cls):
-        """Returns an array (string)  of all valid characters of a label."""
-        return string.ascii_letters + string.digits + ".:_"
+        """Returns a set of all valid characters of a label."""
+        return _VALID_CHARS
 
     @classmethod
     def valid_label_first_char(cls):
-        """Returns an array (string) of all valid 1st characters of a label"""
-        return string.ascii_letters + "."
+        """Returns a set of all valid 1st characters of a label"""
+        return _FIRST_CHARS
 
     @classmethod
     def name_valid_label_chars(cls, line: str):
-        valid = True
-        for c in line:
-            if c in Labels().valid_chars:
-                continue
-            else:
-                valid = False
-                break
-        return valid
+        return not line.translate(_INVALID_CHARS_TR)
 
 
 # def is_valid_label(name: str):
@@ -243,15 +249,14 @@ class Labels(dict):
     Labels()[a_key] = a_label
     a_label = Labels()[a_key]
     """
-    first_chars = string.ascii_letters + "."
-    valid_chars = string.ascii_letters + string.digits + ".:_"
-
-    _labels = {}
+    first_chars = _FIRST_CHARS
+    valid_chars = _VALID_CHARS
 
     def __init__(self):
         """Initialize a Labels dictionary once."""
         super().__init__()
         self._labels = dict()
+        self._sub_re = None
 
     def __repr__(self):
         """Return a str representation of how to re-construct this object."""
@@ -266,16 +271,14 @@ class Labels(dict):
         if key:
             key = (key.lstrip(".")).rstrip(":.")
             key = key.upper()
-        if key in self._labels.keys():
-            return None if key not in self._labels \
-                else self._labels[key]
-        return None
+        return self._labels.get(key)
 
     def __setitem__(self, key: str, value: Label):
         """Set a value in the dictionary with a given key."""
         if not isinstance(value, Label):
             raise TypeError(value)
         self._labels[value.clean_name().upper()] = value
+        self._sub_re = None
 
     def find(self, key: str) -> Label:
         """Equal to the __get__() index function."""
@@ -285,6 +288,7 @@ class Labels(dict):
         """Add a new Label object to the dictionary."""
         if label is not None:
             self._labels[label.clean_name().upper()] = label
+            self._sub_re = None
 
     def remove(self, label: Label):
         """Remove a label from the dictionary.
@@ -293,13 +297,28 @@ class Labels(dict):
         used as the key of the element to remove.
         """
         if label is not None:
-            found = self[label.clean_name().upper()]
-            if found:
-                new_d = dict(self._labels)
-                del new_d[label.clean_name().upper()]
-                self._labels = new_d
+            self._labels.pop(label.clean_name().upper(), None)
+            self._sub_re = None
         return
 
+    def substitute_all(self, line: str) -> str:
+        """
+        Replace every known label in 'line' with its value as a hex
+        expression. All labels are matched in a single regex pass.
+        """
+        if not self._labels or not line:
+            return line
+        if self._sub_re is None:
+            # Longest names first so that .foo_loop wins over .foo
+            names = sorted(self._labels, key=len, reverse=True)
+            alternation = "|".join(re.escape(name) for name in names)
+            # A name inside a number ($CAFE, %LOOP, &END, 0x...) or another
+            # word is not a reference.
+            self._sub_re = re.compile(
+                rf"(?<![\w$%&])(\.?)({alternation})\b:{{0,2}}",
+                re.IGNORECASE)
+        return self._sub_re.sub(self._substitute, line)
+
     def local_labels(self) -> dict:
         """Return a dictionary of just local scoped labels."""
         d = {k: v for k, v in self.items() if v.is_scope_global is False}
@@ -317,5 +336,16 @@ class Labels(dict):
     def remove_all(self):
         """Remove all objects from the dictionary."""
         self._labels.clear()
+        self._sub_re = None
+
+    #                                             #
+    # -----=====<  Private Functions  >=====----- #
+
+    def _substitute(self, match) -> str:
+        label = self._labels[match.group(2).upper()]
+        # .loop and loop are different labels.
+        if label.name().startswith(".") != bool(match.group(1)):
+            return match.group(0)
+        return _EC.string_from_decimal(label.value(), "$")
 
     # --------========[ End of class ]========-------- #
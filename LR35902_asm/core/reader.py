@@ -20,8 +20,6 @@ class Reader(object):
     def read_line(self) -> str:
         if self._strip_comments is True:
             self.strip_comment()
-        print("read_line")
-        pass
 
     def get_position(self):
         pass
@@ -34,14 +32,26 @@ class Reader(object):
 
     def is_eof(self) -> bool:
         return self._eof
+
+    def read_all_lines(self) -> [str]:
+        """Reads every remaining line from the current position to eof."""
+        lines = []
+        while self.is_eof() is False:
+            line = self.read_line()
+            if line is not None:
+                lines.append(line)
+        return lines
+
+    def skip_to_eof(self):
+        """Moves past the remaining lines without returning them."""
+        self.read_all_lines()
     
     def strip_comment(self):
         # A "*" in the first column means the entire line is a comment
         if self._line[0] == "*":
             self._line = ""
             return
-        cleaned = self._line.split(";")
-        self._line = cleaned[0]
+        self._line = self._line.partition(";")[0]
 
 
 # end of class Reader
@@ -85,6 +95,23 @@ class BufferReader(Reader):
         self._eof = True
             #raise EOFError
 
+    def read_all_lines(self) -> [str]:
+        """Returns the remainder of the buffer split into lines."""
+        if self._read_position >= self._len:
+            self._eof = True
+            return []
+        lines = self._buffer[self._read_position:].split(self._delimiter)
+        if not lines[-1]:
+            lines.pop()  # read_line() doesn't return a line after the last delimiter.
+        self._read_position = self._len
+        self._line = lines[-1]
+        self._eof = True
+        return lines
+
+    def skip_to_eof(self):
+        self._read_position = self._len
+        self._eof = True
+
     def get_position(self):
         """Returns the current read position in the file."""
         return self._read_position
@@ -107,12 +134,15 @@ class FileReader (Reader):
     """
     Class to encapsulate the reading of the source as a filesystem file.
     """
+    BUFFER_SIZE = 65536
+
     def __init__(self, filename):
         super().__init__()
         self._filename = filename
         self._line = ""
+        self._filestream = None
         try:
-            self._filestream = open(filename)
+            self._filestream = open(filename, buffering=self.BUFFER_SIZE)
         except OSError:
             self._eof = True
             print(f"Could not open the file: {filename}")
@@ -128,6 +158,23 @@ class FileReader (Reader):
         self._eof = True
         return None
 
+    def read_all_lines(self) -> [str]:
+        """Reads the remainder of the file in one call and splits it into
+        lines."""
+        if self._eof:
+            return []
+        lines = self._filestream.read().split("\n")
+        if not lines[-1]:
+            lines.pop()  # read_line() doesn't return a line after the last newline.
+        self._line = lines[-1] if lines else ""
+        self._eof = True
+        return lines
+
+    def skip_to_eof(self):
+        if not self._eof:
+            self._filestream.seek(0, 2)
+        self._eof = True
+
     def get_position(self):
         return self._filestream.tell()
 
@@ -142,4 +189,16 @@ class FileReader (Reader):
         """Returns the string name of the file being read."""
         return self._filename
 
+    def close(self):
+        """Closes the underlying file. Reading afterwards is an error."""
+        if self._filestream is not None:
+            self._filestream.close()
+        self._eof = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
 ############################ end of class FileReader
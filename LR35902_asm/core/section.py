@@ -15,7 +15,7 @@ A Section token dictionary looks like this:
 
 """
 from __future__ import annotations
-from typing import Optional
+from typing import Optional, TYPE_CHECKING
 
 #
 # Class that parses and contains information about a section.
@@ -31,8 +31,9 @@ from collections import namedtuple
 from .constants import EQU, LBL, STOR, INST, SEC, BRACKETS
 from .conversions import ExpressionConversion as EC
 from .exception import SectionDeclarationError, SectionTypeError
-from .lexer_parser import BasicLexer
-from .tokens import Token
+from ..lexer.lexer_parser import BasicLexer
+if TYPE_CHECKING:
+    from ..tokens import Token  # The tokens package isn't importable yet.
 
 
 # ##############################################################################
@@ -183,8 +184,7 @@ class Section:
     def from_string(cls, text: str):
         """Initialize Section from a string."""
         tok = BasicLexer.from_string(text)
-        tok.tokenize()
-        tok_list = tok.tokenized_list()
+        tok_list = tok.tokenize()
         if len(tok_list):
             if tok_list[0]['directive'] == SEC:
                 return cls(tok_list[0]['tokens'])
@@ -289,13 +289,13 @@ class SectionParser:
             args = self._tokens[2:]
             for (idx, _) in enumerate(args):
                 sym_dict = {"symbol": '', 'param': ''}
-                sym = args[idx].split('[')
-                if not self._sec_type.is_valid_sectiontype(sym[0]):
-                    raise SectionTypeError(f"The section type '{sym[0]}' "
+                symbol, bracket, param = args[idx].partition('[')
+                if not self._sec_type.is_valid_sectiontype(symbol):
+                    raise SectionTypeError(f"The section type '{symbol}' "
                                            "is not a valid section type.")
-                sym_dict["symbol"] = sym[0]
-                if len(sym) > 1:  # Will be something line "$4000]"
-                    exp = sym[1].strip("]")
+                sym_dict["symbol"] = symbol
+                if bracket:  # Will be something line "$4000]"
+                    exp = param.strip("]")
                     val = EC().decimal_from_expression(exp)
                     sym_dict['param'] = exp if val is None else val
                 symbols.append(sym_dict)
@@ -327,5 +327,5 @@ class SectionParser:
 
         sym = section_info[0]
         start_address, end_address = (
-            self._sec_type.sectiontype_info(sym['symbol']))['addr']
-        return SectionAddress(start=start_address, end=end_address)
+            self._sec_type.sectiontype_info(sym['symbol']))['range']
+        return SectionAddress(begin=start_address, end=end_address)
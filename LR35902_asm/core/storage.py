@@ -2,21 +2,19 @@
 # DS, DB, DW, DL declarations
 #
 
-import imp
-try:
-    imp.find_module('gbasm_dev')
+import os
+# Development hook, only looked for when GBASM_DEV is set.
+if os.environ.get("GBASM_DEV"):
     from gbasm_dev import set_gbasm_path
     set_gbasm_path()
-except ImportError:
-    pass
 
 from enum import Enum
 
 from .constants import DIR, TOK, STOR
-from .instruction_pointer import InstructionPointer as IP
+from ..instructions.instruction_pointer import InstructionPointer as IP
 from .conversions import ExpressionConversion as EC
 from .exception import DefineDataError
-from .lexer_parser import is_node_valid, BasicLexer
+from ..lexer.lexer_parser import is_node_valid, BasicLexer
 
 ###############################################################################
 
@@ -28,6 +26,13 @@ class StorageType(Enum):
     LONG = 3
 
 
+# Plain int values of StorageType used when dispatching in the parser.
+_SPACE = StorageType.SPACE.value
+_BYTE = StorageType.BYTE.value
+_WORD = StorageType.WORD.value
+_LONG = StorageType.LONG.value
+
+
 class Storage:
     _roamer = 0
     _parser = None
@@ -49,8 +54,7 @@ class Storage:
         """
         if text:
             tok = BasicLexer.from_string(text)
-            tok.tokenize()
-            return cls(tok.tokenized_list()[0])
+            return cls(tok.tokenize()[0])
         return cls({})
 
     def __str__(self):
@@ -117,7 +121,7 @@ class StorageParser:
             if type_name not in self.types:
                 raise DefineDataError("Storage type must be "
                                       "DS, DB, DW, or DL")
-            self._storage_size = self.types[type_name]
+            self._storage_size = self.types[type_name].value
             self._type_name = type_name
             self._data = bytearray()
             self._parse()
@@ -137,15 +141,10 @@ class StorageParser:
             for idx in range(0, len(self._data), step):
                 val = self._data[idx]
                 if step == 2:
-                    val = val << 8
-                    val += self._data[idx+1]
+                    val = int.from_bytes(self._data[idx:idx + 2], "big")
                     desc += f"{val:04x} "
-                    idx += 1
                 elif step == 4:
-                    val = 0
-                    for x in range(0, 4):
-                        val += self._data[idx+x]
-                        val <<= 8 if x < 3 else 0
+                    val = int.from_bytes(self._data[idx:idx + 4], "big")
                     desc += f"{val:08x} "
                     # Reduce the num of cols to account for the longer strings.
                     col += 1
@@ -160,10 +159,7 @@ class StorageParser:
         return desc
 
     def __repr__(self):
-        args = self._tok[0] + " "
-        for item in self._tok[1:-1]:
-            args += item + ", "
-        args += f"{self._tok[-1:][0]}"
+        args = self._tok[0] + " " + ", ".join(self._tok[1:])
         desc = f"Storage.from_string(\"{args}\")"
         return desc
 
@@ -195,13 +191,13 @@ class StorageParser:
 
     def _parse(self):
         components = self._tok[1:]
-        if self._storage_size == StorageType.SPACE:
+        if self._storage_size == _SPACE:
             self._to_space(components)
-        elif self._storage_size == StorageType.BYTE:
+        elif self._storage_size == _BYTE:
             self._to_bytes(components)
-        elif self._storage_size == StorageType.WORD:
+        elif self._storage_size == _WORD:
             self._to_words(components)
-        elif self._storage_size == StorageType.LONG:
+        elif self._storage_size == _LONG:
             self._to_longs(components)
 
     def _to_space(self, components):
@@ -234,6 +230,7 @@ class StorageParser:
     def _to_bytes(self, data_list):
         in_quotes = False
         bytes_added = 0
+        ec = EC()
         for item in data_list:
             if in_quotes:
                 # If we get a new item and we're still in_quotes, this
@@ -258,7 +255,7 @@ class StorageParser:
                     bytes_added += 1
                 continue
 
-            value = EC().decimal_from_expression(item.strip())
+            value = ec.decimal_from_expression(item.strip())
             if not 256 > value >= 0:
                 msg = "DB should only allow byte value from 0x00 to 0xFF"
                 raise DefineDataError(msg)
@@ -268,37 +265,31 @@ class StorageParser:
 
     def _to_words(self, data_list):
         words_added = 0
+        ec = EC()
         for item in data_list:
-            num = EC().decimal_from_expression(item.strip())
+            num = ec.decimal_from_expression(item.strip())
             if not 65536 > num >= 0:
                 msg = f"DB should only allow byte value from 0x00 to 0xFFFF"
                 raise DefineDataError(msg)
-            vals = self._to_byte_array(num, 16)
-            for v in vals:
-                self._data.append(v)
+            self._data += self._to_byte_array(num, 16)
             words_added += 1
         return words_added
 
     def _to_longs(self, data_list):
         words_added = 0
+        ec = EC()
         for item in data_list:
-            num = EC().decimal_from_expression(item.strip())
+            num = ec.decimal_from_expression(item.strip())
             if not 4294967296 > num >= 0:
                 msg = "DB should only allow byte value from 0x00 to 0xFFFFFFFF"
                 raise DefineDataError(msg)
-            vals = self._to_byte_array(num, 32)
-            for v in vals:
-                self._data.append(v)
+            self._data += self._to_byte_array(num, 32)
             words_added += 2
         return words_added
 
-    def _to_byte_array(self, val, bits) -> bytearray:
-        vals = bytearray()
-        while bits > 0:
-            vals.insert(0, val & 0xff)
-            val = val >> 8
-            bits -= 8
-        return vals
+    def _to_byte_array(self, val, bits) -> bytes:
+        # Fixed width, most significant byte first.
+        return val.to_bytes(bits // 8, "big")
 
 ################################ End of class #################################
 ###############################################################################
@@ -328,8 +328,6 @@ class Symbols(dict):
     first_chars = string.ascii_letters + "."
     valid_chars = string.ascii_letters + string.digits + ".:_"
 
-    _symbols = {}
-
     def __init__(self):
         """Initialize a Symbol object."""
         super().__init__()
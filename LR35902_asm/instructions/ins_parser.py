@@ -77,28 +77,30 @@ class InstructionParser:
                 "ins_def": ins}
         self._tokens = LexerTokens(main)
         tok = main["tok"]  # Tokenized instruction
-        self.state = _State(main["ins_def"], {}, "")
+        self.state = state = _State(main["ins_def"], {}, "")
         operands = [] if "operands" not in tok else tok["operands"]
-        for (_, arg) in enumerate(operands, start=1):
+        # Loop invariant lookups are resolved once per instruction.
+        first_chars = LabelUtils.valid_label_first_char()
+        valid_chars = LabelUtils.name_valid_label_chars
+        for arg in operands:
             # True if the argument is within parens like "(HL)"
-            self.state.arg = arg
+            state.arg = arg
             test = self._if_register()
             if test is True:
                 continue
             elif test is not None:
                 break
-            if self.state.is_arg_in_roamer():  # A direct match (like NZ)
-                self.state.roam_to_arg()
-                self.state.set_operand_to_val(self.state.arg)
+            if state.is_arg_in_roamer():  # A direct match (like NZ)
+                state.roam_to_arg()
+                state.set_operand_to_val(arg)
                 continue
             else:  # Not a register or direct match. Maybe a number or label.
                 if self._if_number():
                     continue
                 # Is this _maybe_ a placeholder? Store it as a possible one.
                 tmp = arg.strip("()")
-                if tmp[0] in LabelUtils.valid_label_first_char():
-                    if LabelUtils.name_valid_label_chars(tmp):
-                        self.state.unresolved = tmp
+                if tmp[0] in first_chars and valid_chars(tmp):
+                    state.unresolved = tmp
         if "!" in self.state.roamer:
             # This means that the instruction was found and processed
             dec_val = self.state.roamer["!"]
@@ -121,14 +123,13 @@ class InstructionParser:
 
     @staticmethod
     def plus_split(clean) -> list:
-        _split = None
-        if "(HL+)" in clean or "(HL-)" in clean:
+        # Most operands have no "+" at all so that is ruled out first.
+        idx = clean.find("+")
+        if idx < 0 or clean.find("+", idx + 1) >= 0:
+            return None
+        if clean[idx - 3:idx + 2] == "(HL+)" or "(HL-)" in clean:
             return None
-        if "+" in clean:
-            _tmp = clean.split("+")
-            if len(_tmp) == 2:
-                _split = _tmp
-        return _split
+        return [clean[:idx], clean[idx + 1:]]
 
     @staticmethod
     def _int_to_z80binary(dec_val, little_endian=True, bits=8) -> bytearray:
@@ -142,17 +143,14 @@ class InstructionParser:
         """
         if dec_val < 0 or dec_val > 65535:
             return None
-        ba = bytearray()
-        hexi = f"%04x" % dec_val
-        low = "0x" + hexi[2:]  # 0xffd2 == 0xd2
-        high = "0x" + hexi[0:2]  # 0xffd2 == 0xff
-        ba.append(int(low, 16))
-        if bits == 16:
-            ba.append(int(high, 16))
-        # Normally little endian. If not, reverse the order to (hi, lo)
-        if not little_endian and len(ba) == 2:
-            ba.reverse()
-        return ba
+        low = dec_val & 0xFF  # 0xffd2 == 0xd2
+        if bits != 16:
+            return bytearray((low,))
+        high = dec_val >> 8  # 0xffd2 == 0xff
+        # Normally little endian. If not, the order is (hi, lo)
+        if little_endian:
+            return bytearray((low, high))
+        return bytearray((high, low))
 
     def _if_register(self):
         """
@@ -198,7 +196,7 @@ class InstructionParser:
             bits = "8" if dec_val < 256 else "16"
             if len(_arg) > 3 and bits == "8":
                 bits = "16"
-            placeholder = self._ph_in_list(self.state.roamer.keys(),
+            placeholder = self._ph_in_list(self.state.roamer,
                                            parens=arg_parens,
                                            bits=bits,
                                            sp=is_sp)
@@ -311,13 +309,11 @@ class _State:
 
     def append_bytes(self, new_bytes: bytearray):
         if new_bytes:
-            for b in new_bytes:
-                self.ins_bytes.append(b)
+            self.ins_bytes += new_bytes
 
     def prepend_bytes(self, new_bytes: bytearray):
         if new_bytes:
-            for b in new_bytes:
-                self.ins_bytes.insert(0, b)
+            self.ins_bytes[:0] = new_bytes
 
     @property
     def arg(self):
@@ -335,8 +331,7 @@ class _State:
 
     def merge_operands(self, into: dict):
         if into:
-            for key in self.operands.keys():
-                into[key] = self.operands[key]
+            into.update(self.operands)
 
     def get_instruction_detail(self, byte: int) -> dict:
         if byte is None:
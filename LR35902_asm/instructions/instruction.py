@@ -3,12 +3,14 @@
 Class(es) that implements a Z80/LR35902 instruction and Instruction Set
 """
 
-from .lexer_results import LexerResults
-from .lexer_parser import InstructionParser, BasicLexer
+from ..lexer.lexer_results import LexerResults
+from ..lexer.lexer_parser import InstructionParser, BasicLexer
 
 
 class Instruction():
     """ Encapsulates an individual Z80 instruction """
+    __slots__ = ("_tokens", "_node", "_lex_results", "_placeholder_string",
+                 "labels")
 
     def __init__(self, node: dict):
         ip = InstructionParser(node)
@@ -22,8 +24,7 @@ class Instruction():
         """ Builds and Instruction object from plain text. """
         lex = BasicLexer.from_string(text)
         if lex:
-            lex.tokenize()
-            return cls(lex.tokenized_list()[0])
+            return cls(lex.tokenize()[0])
         return cls({})
 
     def __str__(self):
@@ -36,17 +37,16 @@ class Instruction():
             desc += " ;;"
         if self._lex_results:
             if self.machine_code():
-                desc += " "
-                for byte in self.machine_code():
-                    desc += f"{byte:02x} ".upper()
+                desc += " " + "".join(f"{byte:02X} "
+                                      for byte in self.machine_code())
             else:
                 if self._lex_results.operand1_error():
                     desc += "  Op1 error = " + \
-                        self._lex_results.operand1_error().__repr__()
+                        self._lex_results.operand1_error().format()
                     desc += "\n"
                 if self._lex_results.operand2_error():
                     desc += "  Op2 error = " + \
-                        self._lex_results.operand2_error().__repr__()
+                        self._lex_results.operand2_error().format()
                     desc += "\n"
             # if self.placeholder():
             #     desc += "Placeholder = " + self.placeholder()
@@ -29,7 +29,7 @@ class InstructionPointer():
         """Return the string representation of the IP."""
         desc = "No value"
         if self._pointer is not None:
-            desc = f"Address: {self._pointer:04x}".upper()
+            desc = f"ADDRESS: {self._pointer:04X}"
         return desc
 
     @property
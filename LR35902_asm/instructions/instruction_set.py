@@ -1,11 +1,14 @@
 """Class(es) that implements a Z80/LR35902 instruction and Instruction Set."""
 
-import io
 import json
+import marshal
+import os
+import sys
+import tempfile
 from singleton_decorator import singleton
 
-from .lr35902_data import LR35902Data
-from .expression import Expression, ExpressionSyntaxError
+from ..lr35902_data import LR35902Data
+from ..core.expression import Expression, ExpressionSyntaxError
 
 #
 # Special internal functions.
@@ -16,7 +19,7 @@ def _gen_LR35902_inst() -> dict:
     # -------------------------------------------------------
     def _load_cpu_data() -> dict:
         try:
-            return json.load(io.StringIO(LR35902Data().json))
+            return json.loads(LR35902Data().json)
         except json.JSONDecodeError:
             return None
     # -------------------------------------------------------
@@ -27,6 +30,9 @@ def _gen_LR35902_inst() -> dict:
         return None
 
     instructions = {}
+    # (mnemonic, operand1, operand2) -> opcode with None for a missing
+    # operand. One lookup instead of walking the nested instructions.
+    flat = {}
 
     """
     This creates a 'shorthand' version of the LR35902 instruction set that
@@ -37,6 +43,9 @@ def _gen_LR35902_inst() -> dict:
         mnemonic = node['mnemonic'] if 'mnemonic' in node else None
         if mnemonic is None or mnemonic == "PREFIX":
             continue
+        # Interned so that matching source tokens (also interned by the
+        # lexer) against the instruction set compares by identity.
+        mnemonic = sys.intern(mnemonic)
 
         try:
             expr = Expression(hex_code).to_decimal()
@@ -46,6 +55,9 @@ def _gen_LR35902_inst() -> dict:
             term = {"!": "00"}
         op1 = node["operand1"] if "operand1" in node else None
         op2 = node["operand2"] if "operand2" in node else None
+        op1 = sys.intern(op1) if op1 is not None else None
+        op2 = sys.intern(op2) if op2 is not None else None
+        flat[(mnemonic, op1, op2)] = term["!"]
 
         existing = {} if mnemonic not in instructions \
             else instructions[mnemonic]
@@ -68,7 +80,68 @@ def _gen_LR35902_inst() -> dict:
             existing = line
         instructions[mnemonic] = existing
     # End for
-    return {"instructions": instructions, "raw_data": raw_data}
+    return {"instructions": instructions, "raw_data": raw_data,
+            "flat": flat}
+
+
+# Bumped whenever the layout of the generated dict changes. The cache also
+# records the modification times of the data module and of this module so
+# that editing either one regenerates it on its own.
+_CACHE_VERSION = 5
+# A single file in the user's cache directory. The installed package is
+# never written to.
+_CACHE_FILE = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or
+    os.path.join(os.path.expanduser("~"), ".cache"),
+    "dmgasm", "lr35902.marshal")
+
+
+def _load_LR35902_inst() -> dict:
+    """
+    Returns the generated instruction set. The result is marshalled to the
+    cache file with a stamp of the modules it was built from and is reused
+    for as long as the stamp matches.
+    """
+    source = sys.modules[LR35902Data.__module__].__file__
+    try:
+        stamp = (_CACHE_VERSION, os.stat(source).st_mtime_ns,
+                 os.stat(__file__).st_mtime_ns)
+    except OSError:
+        return _gen_LR35902_inst()
+    try:
+        with open(_CACHE_FILE, "rb") as cached:
+            cached_stamp, data = marshal.load(cached)
+        if cached_stamp == stamp:
+            return data
+    except (OSError, EOFError, ValueError, TypeError):
+        pass  # Missing or unreadable, so generate it again.
+    data = _gen_LR35902_inst()
+    if data is not None:
+        _write_LR35902_cache((stamp, data))
+    return data
+
+
+def _write_LR35902_cache(payload: tuple):
+    """
+    Writes the cache under a temporary name and then renames it so that a
+    concurrent import never reads a partial file. The previous cache file
+    is replaced, so stale copies don't pile up.
+    """
+    cache_dir = os.path.dirname(_CACHE_FILE)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        handle, temp = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+    except OSError:
+        return  # Without a writable cache directory just skip the cache.
+    try:
+        with os.fdopen(handle, "wb") as cached:
+            marshal.dump(payload, cached)
+        os.replace(temp, _CACHE_FILE)
+    except OSError:
+        try:
+            os.remove(temp)
+        except OSError:
+            pass
 
 # ############################################################################
 
@@ -108,23 +181,32 @@ class InstructionSet():
            It's value represents the actual instruction 
     """
 
-    data = _gen_LR35902_inst()
+    data = _load_LR35902_inst()
     LR35902 = data["instructions"]
     LR35902_detail = data["raw_data"]
-
-    def __init__(self):
-        """Initialize the InstructionSet object."""
-        pass
-        # -----=====< End of __init__() >=====----- #
+    LR35902_flat = data["flat"]
+    mnemonics = frozenset(LR35902)
+    # Every operand string used by the instruction set.
+    operands = frozenset(op for (_, op1, op2) in LR35902_flat
+                         for op in (op1, op2) if op is not None)
+    # First characters of every mnemonic (either case) so that callers can
+    # rule out most non-mnemonics before a full lookup.
+    mnemonic_first_chars = frozenset(char for mnemonic in LR35902
+                                     for char in (mnemonic[0],
+                                                  mnemonic[0].lower()))
 
     def instruction_from_mnemonic(self, mnemonic: str) -> dict:
         """Get the instruction definition dict for the given mnemonic."""
-        return self.LR35902[mnemonic] if mnemonic in self.LR35902 else None
+        return self.LR35902.get(mnemonic)
+
+    def instruction_from_operands(self, mnemonic: str, op1: str = None,
+                                  op2: str = None) -> int:
+        """Get the opcode for a mnemonic and its exact operands or None."""
+        return self.LR35902_flat.get((mnemonic, op1, op2))
 
     def instruction_detail_from_byte(self, byte: str) -> dict:
         """Get the instruction detail from a specific byte."""
-        return self.LR35902_detail[byte] \
-            if byte in self.LR35902_detail else None
+        return self.LR35902_detail.get(byte)
 
     @property
     def instruction_set(self):
@@ -133,14 +215,10 @@ class InstructionSet():
 
     def is_mnemonic(self, mnemonic_string: str) -> bool:
         """Test if the string represent a mnemonic."""
-        return True if mnemonic_string.upper() in self.LR35902 else False
-
-    #                                             #
-    # -----=====<  Private Functions  >=====----- #
-
-    def _merge(self, target, source):
-        """Merge target and source."""
-        return source if target is None else {**target, **source}
+        # The lexer hands over upper-cased text so try it as-is first.
+        mnemonics = self.mnemonics
+        return mnemonic_string in mnemonics or \
+            mnemonic_string.upper() in mnemonics
 
 # --------========[ End of InstructionSet class ]========-------- #
 
@@ -1,26 +1,67 @@
+import copy
+import hashlib
+import os
+import pickle
 import pprint
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional
 
 from ..core.exception import Error, ErrorCode
 from ..core.conversions import ExpressionConversion
-from ..core.reader import Reader, BufferReader
-from ..core.constants import DIRECTIVES, STORAGE_DIRECTIVES
-from ..core.constants import DIR, TOK, MULT, LBL, INST, STOR, BAD
+from ..core.reader import Reader, BufferReader, FileReader
+from ..core.constants import DIRECTIVE_TYPES, DIRECTIVES
+from ..core.constants import DIR, TOK, MULT, LBL, INST, BAD
 from ..core.registers import Registers
 from ..instructions.instruction_set import InstructionSet as IS
 from .lexer_results import LexerResults, LexerTokens
 from ..core.label import LabelUtils
 
 EC = ExpressionConversion
+# Part of every token cache file name. Bump it whenever the lexer's output
+# changes so that caches written by an older lexer are not loaded.
+TOKEN_CACHE_VERSION = 1
+# The converter is a singleton so one instance is kept for every call.
+_EC = EC()
+
+# A token is any run of characters that isn't whitespace or a comma.
+_TOKEN_RE = re.compile(r"[^\s,]+")
+# An opening bracket up to its closing bracket (or the end of the line)
+# and a test for a bracket opened before the previous one was closed.
+_PAREN_RE = re.compile(r"[(\[{][^)\]}]*(?:[)\]}]|$)")
+_NESTED_RE = re.compile(r"[(\[{][^)\]}]*[(\[{]")
+# The 8 and 16-bit placeholders of the instruction set.
+_PH_8 = ("r8", "a8", "d8")
+_PH_8_SP = _PH_8 + ("SP+r8",)
+_PH_16 = ("a16", "d16")
+# IS is a singleton wrapper so class attributes are read off the instance.
+_MNEMONIC_FIRST_CHARS = IS().mnemonic_first_chars
+# The instruction set never changes so its lookups are bound once.
+_instruction_from_mnemonic = IS().instruction_from_mnemonic
+_instruction_detail_from_byte = IS().instruction_detail_from_byte
+_instruction_from_operands = IS().instruction_from_operands
+# Maps each mnemonic, operand and directive to its interned copy.
+_VOCABULARY = {word: sys.intern(word)
+               for word in IS().mnemonics | IS().operands | DIRECTIVES}
 
 
 class BasicLexer:
     """ """
 
-    def __init__(self, reader: Reader):
+    def __init__(self, reader: Reader, cache_dir: Optional[str] = None):
+        """
+        An optional 'cache_dir' is where the tokenized lines of a source
+        file are pickled so that an unchanged file isn't lexed again on the
+        next run. The pickles in cache_dir are loaded as they are, so it
+        must only ever hold files written by this lexer.
+        """
         self._line_no: int = 0
         self._tokenized: list = []
         self._reader = reader
-        self._file_name = reader.filename
+        self._file_name = reader.filename()
+        self._cache_dir = cache_dir
 
     @classmethod
     def from_string(cls, text: str):
@@ -28,39 +69,132 @@ class BasicLexer:
         reader = BufferReader(text, strip_comments=True)
         return cls(reader)
 
-    def tokenize(self):
-        """Tokenizes the the Reader starting at the current read position."""
-        while self._reader.is_eof() is False:
-            line = self._reader.read_line()
+    @classmethod
+    def tokenize_files(cls, paths: List[str]) -> Dict[str, List[dict]]:
+        """
+        Tokenizes each of the source files and returns a dictionary of the
+        tokenized lines keyed by file path. Files are lexed in parallel
+        across worker processes.
+        """
+        if len(paths) < 2:
+            return dict(map(_tokenize_file, paths))
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as pool:
+            return dict(pool.map(_tokenize_file, paths))
+
+    def tokenize(self) -> List[dict]:
+        """
+        Tokenizes the the Reader starting at the current read position and
+        returns the list of all tokenized lines.
+        """
+        self._tokenized.extend(self.tokenize_iter())
+        return self._tokenized
+
+    def tokenize_iter(self) -> Iterator[dict]:
+        """
+        Yields each tokenized line from the Reader starting at the current
+        read position without keeping them in the tokenized list. When a
+        cache_dir was given the lines come from, or are saved to, the
+        token cache.
+        """
+        cache_path = self._cache_path()
+        if cache_path is None:
+            yield from self._lex_lines()
+            return
+        tokens = self._read_cache(cache_path)
+        if tokens is None:
+            tokens = list(self._lex_lines())
+            self._write_cache(cache_path, tokens)
+        else:
+            # Leave the reader at eof just as lexing it would have.
+            self._reader.skip_to_eof()
+            self._line_no += len(tokens)
+        yield from tokens
+
+    def tokenized_list(self):
+        """
+        Returns the array of tokenized lines in the source file.
+        """
+        return self._tokenized
+
+    #                                             #
+    # -----=====<  Private Functions  >=====----- #
+
+    def _lex_lines(self) -> Iterator[dict]:
+        for line in self._reader.read_all_lines():
             if line:
                 if line[0] == "*":  # This is a line comment. Ignore it.
                     continue
-                line = line.upper().split(";")[0].strip()  # drop comments
+                line = line.partition(";")[0].strip().upper()  # drop comments
                 if not line:
                     continue
                 self._line_no += 1
-                tokens = tokenize_line(line)
+                tokens = _tokenize_clean(line)
                 tokens['source_line'] = self._line_no
-                self._tokenized.append(tokens)
+                yield tokens
 
-    def tokenized_list(self):
+    def _cache_path(self) -> Optional[str]:
         """
-        Returns the array of tokenized lines in the source file.
+        Returns the cache file for the source file being read or None if
+        caching doesn't apply. The key includes the lexer's cache version
+        and the file's modification time and size so that a new lexer or an
+        edited file lexes the file again.
         """
-        return self._tokenized
+        if self._cache_dir is None or self._reader.get_position() != 0:
+            return None
+        try:
+            stat = os.stat(self._file_name)
+        except (OSError, TypeError):
+            return None  # Not a file on disk (e.g. a BufferReader).
+        path = os.path.abspath(self._file_name)
+        key = hashlib.blake2b(path.encode(), digest_size=16).hexdigest()
+        name = f"{key}.v{TOKEN_CACHE_VERSION}.{stat.st_mtime_ns}." \
+            f"{stat.st_size}.pkl"
+        return os.path.join(self._cache_dir, name)
+
+    @staticmethod
+    def _read_cache(cache_path: str) -> Optional[List[dict]]:
+        try:
+            with open(cache_path, "rb") as cache:
+                return pickle.load(cache)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+
+    def _write_cache(self, cache_path: str, tokens: List[dict]):
+        # Written to a temporary name first so that a concurrent reader
+        # never sees a partial file.
+        temp_path = f"{cache_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self._cache_dir, exist_ok=True)
+            with open(temp_path, "wb") as cache:
+                pickle.dump(tokens, cache, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, cache_path)
+        except OSError:
+            return  # The cache is only an optimization.
+        # Older copies for the same source file can never be read again.
+        name = os.path.basename(cache_path)
+        prefix = name.partition(".")[0] + "."
+        for entry in os.listdir(self._cache_dir):
+            if entry.startswith(prefix) and entry.endswith(".pkl") and \
+                    entry != name:
+                try:
+                    os.remove(os.path.join(self._cache_dir, entry))
+                except OSError:
+                    pass
 
     # --------========[ End of class ]========-------- #
 
 
+def _tokenize_file(path: str) -> tuple:
+    """Worker for BasicLexer.tokenize_files()."""
+    with FileReader(path) as reader:
+        return path, BasicLexer(reader).tokenize()
+
+
 def is_node_valid(node: dict) -> bool:
     """
     Returns True if the provided node contains a directive and token.
     """
-    result = False
-    if node:
-        if DIR in node and TOK in node:
-            result = True
-    return result
+    return bool(node) and DIR in node and TOK in node
 
 
 def is_compound_node(node: dict) -> bool:
@@ -82,89 +216,88 @@ def is_compound_node(node: dict) -> bool:
     return result
 
 
-def tokenize_line(line: str) -> dict:
+def classify_line(first: str, line: str) -> str:
     """
-    Tokenizes a line of text into usable assembler chunks. Chunks are
-    validated and a tokenized dictionary is returned.
+    Returns the directive a line belongs to based on its first token. BAD
+    is returned if the line can't be classified.
     """
-    from .label import LabelUtils
+    kind = DIRECTIVE_TYPES.get(first)
+    if kind is not None:
+        return kind
+    if first[0] in _MNEMONIC_FIRST_CHARS and _is_mnemonic(first):
+        return INST
+    if line[0] in LabelUtils.valid_label_first_char() and \
+            _is_valid_label(first):
+        return LBL
+    return BAD
 
-    clean = line.strip().split(';')[0]
-    if not clean:
-        return None  # Empy line
-    tokens = {}
-    clean = _join_parens(line)
-    clean_split = clean.replace(',', ' ').split()
-    if clean_split[0] in DIRECTIVES:
-        tokens[DIR] = clean_split[0]
-        tokens[TOK] = clean_split
-    elif clean_split[0] in STORAGE_DIRECTIVES:
-        tokens[DIR] = STOR
-        tokens[TOK] = clean_split
-    elif IS().is_mnemonic(clean_split[0]):
-        tokens[DIR] = INST
-        tokens[TOK] = clean_split
-    elif line[0] in LabelUtils.valid_label_first_char():
-        if LabelUtils.is_valid_label(clean_split[0]):
-            tokens[DIR] = LBL
-            data = clean_split
-            if len(clean_split) > 1:
-                data = [{DIR: LBL, TOK: clean_split[0]}]
-                tokens[DIR] = MULT
-                remainder = ' '.join(clean_split[1:])
-                more = tokenize_line(remainder)
-                data.append(more)
-                tokens[TOK] = data
-            else:
-                tokens[TOK] = clean_split[0]
-    if not tokens:
-        tokens[DIR] = BAD
-        tokens[TOK] = clean_split
-    return tokens
+
+# The same mnemonics and label names repeat all through a source file. Both
+# caches are bounded so a very large file can't grow them without limit.
+@lru_cache(maxsize=512)
+def _is_mnemonic(first: str) -> bool:
+    return IS().is_mnemonic(first)
+
+
+@lru_cache(maxsize=4096)
+def _is_valid_label(first: str) -> bool:
+    return LabelUtils.is_valid_label(first)
 
 
-def tokenize_line2(line: str) -> dict:
+def tokenize_line(line: str) -> Optional[dict]:
     """
     Tokenizes a line of text into usable assembler chunks. Chunks are
     validated and a tokenized dictionary is returned.
     """
-
-    clean = line.strip().split(';')[0]
+    clean = line.partition(';')[0].strip()
     if not clean:
         return None  # Empy line
-    tokens = {}
+    return _tokenize_clean(clean)
+
+
+def _tokenize_clean(line: str) -> dict:
+    """
+    Tokenizes a line that has already been stripped of its comment and
+    surrounding whitespace.
+    """
     clean = _join_parens(line)
-    clean_split = clean.replace(',', ' ').split()
-    if clean_split[0] in DIRECTIVES:
-        tokens[DIR] = clean_split[0]
-        tokens[TOK] = clean_split
-    elif clean_split[0] in STORAGE_DIRECTIVES:
-        tokens[DIR] = STOR
-        tokens[TOK] = clean_split
-    elif IS().is_mnemonic(clean_split[0]):
-        tokens[DIR] = INST
-        tokens[TOK] = clean_split
-    elif line[0] in LabelUtils.valid_label_first_char():
-        if LabelUtils.is_valid_label(clean_split[0]):
-            tokens[DIR] = LBL
-            data = clean_split
-            if len(clean_split) > 1:
-                data = [{DIR: LBL, TOK: clean_split[0]}]
-                tokens[DIR] = MULT
-                remainder = ' '.join(clean_split[1:])
-                more = tokenize_line(remainder)
-                data.append(more)
-                tokens[TOK] = data
-            else:
-                tokens[TOK] = clean_split[0]
-    if not tokens:
-        tokens[DIR] = BAD
-        tokens[TOK] = clean_split
+    # Swapping known words for their interned copies lets the instruction
+    # set lookups match on identity. Labels and numbers are left alone
+    # rather than interning every one of them for the life of the process.
+    clean_split = [_VOCABULARY.get(word, word)
+                   for word in _TOKEN_RE.findall(clean)]
+    return _tokenize_split(clean_split, line)
+
+
+def _tokenize_split(clean_split: List[str], line: str) -> dict:
+    """
+    Builds the tokenized dictionary from a line that has already been split
+    into tokens. 'line' is only used to look at its first character.
+    """
+    tokens: dict = {}
+    kind = classify_line(clean_split[0], line)
+    tokens[DIR] = kind
+    tokens[TOK] = clean_split
+    if kind == LBL:
+        if len(clean_split) > 1:
+            # Labels can't nest so the rest of the line is classified in
+            # place, reusing the tokens that were already split.
+            remainder = clean_split[1:]
+            more_kind = classify_line(remainder[0], remainder[0])
+            tokens[DIR] = MULT if more_kind != LBL else BAD
+            tokens[TOK] = [{DIR: LBL, TOK: clean_split[0]},
+                           {DIR: more_kind, TOK: remainder}]
+        else:
+            tokens[TOK] = clean_split[0]
     return tokens
 
 
-def _join_parens(line) -> str:
-    new_str = ""
+def _join_parens(line: str) -> str:
+    """Removes the spaces that appear within (), [] or {} brackets."""
+    if _NESTED_RE.search(line) is None:
+        return _PAREN_RE.sub(_squash_spaces, line)
+    # Nested brackets need the depth tracked by hand.
+    parts: List[str] = []
     paren = 0
     for char in line:
         if char == " " and paren > 0:
@@ -172,10 +305,13 @@ def _join_parens(line) -> str:
         if char in "([{":
             paren += 1
         elif char in ")]}":
-            paren -= 1
-        paren = max(0, paren)  # If Negative set to 0
-        new_str += char
-    return new_str
+            paren = max(0, paren - 1)  # If Negative set to 0
+        parts.append(char)
+    return "".join(parts)
+
+
+def _squash_spaces(match: re.Match) -> str:
+    return match.group(0).replace(" ", "")
 
 # --------========[ End of LexerResults class ]========-------- #
 
@@ -189,7 +325,17 @@ class InstructionParser:
         self._final = {}
         self.state = None
         if is_node_valid(node):
-            self._final = self._parse(node[TOK])
+            template = _parse_template(tuple(node[TOK]))
+            if template:
+                # The template is shared, so every parser gets its own
+                # copy of both the results and the tokens.
+                final, opcode, operands, ins_def = template
+                self._final = copy.deepcopy(final)
+                self._tokens = LexerTokens(
+                    {"tok": {"opcode": opcode, "operands": list(operands)},
+                     "ins_def": ins_def})
+            else:
+                self._final = self._parse(node[TOK])
 
     @classmethod
     def from_string(cls, instruction: str):
@@ -199,8 +345,7 @@ class InstructionParser:
         if instruction:
             lex = BasicLexer.from_string(instruction)
             if lex:
-                lex.tokenize()
-                return cls(lex.tokenized_list()[0])
+                return cls(lex.tokenize()[0])
         return cls({})
 
     def __repr__(self):
@@ -232,37 +377,42 @@ class InstructionParser:
         """
 
         mnemonic = tokens[0]
-        ins = IS().instruction_from_mnemonic(mnemonic)
+        ins = _instruction_from_mnemonic(mnemonic)
         main = {"tok": {"opcode": mnemonic, "operands": tokens[1:]},
                 "ins_def": ins}
         self._tokens = LexerTokens(main)
+        exact = self._parse_exact(mnemonic, tokens[1:])
+        if exact is not None:
+            return exact
         tok = main["tok"]  # Tokenized instruction
-        self.state = _State(main["ins_def"], {}, "")
+        self.state = state = _State(main["ins_def"], {}, "")
         operands = [] if "operands" not in tok else tok["operands"]
-        for (_, arg) in enumerate(operands, start=1):
+        # Loop invariant lookups are resolved once per instruction.
+        first_chars = LabelUtils.valid_label_first_char()
+        valid_chars = LabelUtils.name_valid_label_chars
+        for arg in operands:
             # True if the argument is within parens like "(HL)"
-            self.state.arg = arg
+            state.arg = arg
             test = self._if_register()
             if test is True:
                 continue
             elif test is not None:
                 break
-            if self.state.is_arg_in_roamer():  # A direct match (like NZ)
-                self.state.roam_to_arg()
-                self.state.set_operand_to_val(self.state.arg)
+            if state.is_arg_in_roamer():  # A direct match (like NZ)
+                state.roam_to_arg()
+                state.set_operand_to_val(arg)
                 continue
             else:  # Not a register or direct match. Maybe a number or label.
                 if self._if_number():
                     continue
                 # Is this _maybe_ a placeholder? Store it as a possible one.
                 tmp = arg.strip("()")
-                if tmp[0] in LabelUtils.valid_label_first_char():
-                    if LabelUtils.name_valid_label_chars(tmp):
-                        self.state.unresolved = tmp
+                if tmp[0] in first_chars and valid_chars(tmp):
+                    state.unresolved = tmp
         if "!" in self.state.roamer:
             # This means that the instruction was found and processed
             dec_val = self.state.roamer["!"]
-            byte = EC().expression_from_decimal(dec_val, "$")
+            byte = _EC.string_from_decimal(dec_val, "$")
             # Add the binary mnemonic value to the binary array (ba)
             hex_data = self._int_to_z80binary(dec_val)
             self.state.prepend_bytes(hex_data)
@@ -275,20 +425,39 @@ class InstructionParser:
         failure["error"] = True
         return failure
 
+    def _parse_exact(self, mnemonic: str, operands: list) -> dict:
+        """
+        Operands that are only registers or conditions match an opcode with
+        a single lookup in the flat instruction table. None is returned for
+        anything else so that it is parsed through the nested table.
+        """
+        if len(operands) > 2:
+            return None
+        args = [arg.strip() for arg in operands]
+        key = args + [None] * (2 - len(args))
+        dec_val = _instruction_from_operands(mnemonic, key[0], key[1])
+        if dec_val is None:
+            return None
+        self.state = _State({}, {}, "")
+        for index, arg in enumerate(args, start=1):
+            self.state.operands[f"operand{index}"] = arg
+        self.state.prepend_bytes(self._int_to_z80binary(dec_val))
+        byte = _EC.string_from_decimal(dec_val, "$")
+        return self.state.get_instruction_detail(byte)
+
     def _is_within_parens(self, value: str) -> bool:
         clean = value.strip()
         return clean.startswith("(") and clean.endswith(")")
 
     @staticmethod
     def plus_split(clean) -> list:
-        _split = None
-        if "(HL+)" in clean or "(HL-)" in clean:
+        # Most operands have no "+" at all so that is ruled out first.
+        idx = clean.find("+")
+        if idx < 0 or clean.find("+", idx + 1) >= 0:
             return None
-        if "+" in clean:
-            _tmp = clean.split("+")
-            if len(_tmp) == 2:
-                _split = _tmp
-        return _split
+        if clean[idx - 3:idx + 2] == "(HL+)" or "(HL-)" in clean:
+            return None
+        return [clean[:idx], clean[idx + 1:]]
 
     @staticmethod
     def _int_to_z80binary(dec_val, little_endian=True, bits=8) -> bytearray:
@@ -302,17 +471,14 @@ class InstructionParser:
         """
         if dec_val < 0 or dec_val > 65535:
             return None
-        ba = bytearray()
-        hexi = f"%04x" % dec_val
-        low = "0x" + hexi[2:]  # 0xffd2 == 0xd2
-        high = "0x" + hexi[0:2]  # 0xffd2 == 0xff
-        ba.append(int(low, 16))
-        if bits == 16:
-            ba.append(int(high, 16))
-        # Normally little endian. If not, reverse the order to (hi, lo)
-        if not little_endian and len(ba) == 2:
-            ba.reverse()
-        return ba
+        low = dec_val & 0xFF  # 0xffd2 == 0xd2
+        if bits != 16:
+            return bytearray((low,))
+        high = dec_val >> 8  # 0xffd2 == 0xff
+        # Normally little endian. If not, the order is (hi, lo)
+        if little_endian:
+            return bytearray((low, high))
+        return bytearray((high, low))
 
     def _if_register(self):
         """
@@ -356,12 +522,11 @@ class InstructionParser:
                 is_sp = True
                 plus = _arg
                 _arg = _split[1]
-        dec_val = EC().decimal_from_expression(_arg)
-        if dec_val:  # Is this an immediate value?
-            bits = "8" if dec_val < 256 else "16"
-            if len(_arg) > 3 and bits == "8":
-                bits = "16"
-            placeholder = self._ph_in_list(self.state.roamer.keys(),
+        dec_val = _EC.decimal_from_expression(_arg)
+        if dec_val is not None:  # Is this an immediate value?
+            # More than 3 characters ($FFF) is 16 bits whatever the value.
+            bits = "16" if len(_arg) > 3 or dec_val > 255 else "8"
+            placeholder = self._ph_in_list(self.state.roamer,
                                            parens=arg_parens,
                                            bits=bits,
                                            sp=is_sp)
@@ -393,39 +558,43 @@ class InstructionParser:
         apears in the list. Otherwise, None.
         """
         ph_key = None
-        found = False
-        regs8 = ["r8", "a8", "d8", "SP+r8"] if sp else ["r8", "a8", "d8"]
-        regs = {"8": regs8, "16": ["a16", "d16"]}
         eight = "8" if not parens else "8)"
         sixteen = "16" if not parens else "16)"
         if bits == "8":
-            for k in ph_list:
-                if k.find(eight) != -1:  # Maybe an 8-bit placeholder key
-                    ph_key = k
-                    break
+            # Maybe an 8-bit placeholder key
+            ph_key = next((k for k in ph_list if eight in k), None)
         # if we are 16 bits or an 8-bit value isn't found...
         if not ph_key:
-            for k in ph_list:
-                if k.find(sixteen) != -1:
-                    ph_key = k
-                    break
+            ph_key = next((k for k in ph_list if sixteen in k), None)
         if ph_key:
-            for r in regs["8"]:
-                if ph_key.find(r) >= 0:
-                    found = True
-                    break
-            if not found:
-                for r in regs["16"]:
-                    if ph_key.find(r) >= 0:
-                        found = True
-                        break
-        if found:
-            return ph_key
+            for r in (_PH_8_SP if sp else _PH_8) + _PH_16:
+                if r in ph_key:
+                    return ph_key
         return None
 
     # --------========[ End of InstructionParser class ]========-------- #
 
 
+@lru_cache(maxsize=4096)
+def _parse_template(tokens: tuple) -> tuple:
+    """
+    Parses an instruction's tokens and returns a (results, opcode,
+    operands, definition) template when the instruction is fully valid,
+    otherwise None. Callers clone the template rather than sharing it.
+    Assembly source repeats the same instructions a lot so successful
+    parses are memoized. Invalid parses only cache the None marker so the
+    caller re-parses them for the error details, which may depend on
+    labels that have yet to be defined.
+    """
+    parser = InstructionParser({})
+    final = parser._parse(list(tokens))
+    lexer_tokens = parser.tokens()
+    if LexerResults(final, lexer_tokens).is_valid():
+        return (final, lexer_tokens.opcode(), tuple(lexer_tokens.operands()),
+                lexer_tokens.definition())
+    return None
+
+
 class _State:
     """ An internal lexer state class """
     roamer: dict
@@ -474,13 +643,11 @@ class _State:
 
     def append_bytes(self, new_bytes: bytearray):
         if new_bytes:
-            for b in new_bytes:
-                self.ins_bytes.append(b)
+            self.ins_bytes += new_bytes
 
     def prepend_bytes(self, new_bytes: bytearray):
         if new_bytes:
-            for b in new_bytes:
-                self.ins_bytes.insert(0, b)
+            self.ins_bytes[:0] = new_bytes
 
     @property
     def arg(self):
@@ -498,15 +665,14 @@ class _State:
 
     def merge_operands(self, into: dict):
         if into:
-            for key in self.operands.keys():
-                into[key] = self.operands[key]
+            into.update(self.operands)
 
     def get_instruction_detail(self, byte: int) -> dict:
-        if byte is None:
-            final = {}
-        else:
-            final = IS().instruction_detail_from_byte(byte)
-        if final is not None:
+        detail = {} if byte is None else _instruction_detail_from_byte(byte)
+        final = None
+        if detail is not None:
+            # A copy, since the detail dict belongs to the instruction set.
+            final = dict(detail)
             final["bytes"] = bytes(self.ins_bytes)
             if self.unresolved:
                 final["unresolved"] = self.unresolved
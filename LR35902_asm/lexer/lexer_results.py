@@ -1,12 +1,14 @@
 """
 """
-from .exception import Error
+from ..core.exception import Error
 
 class LexerTokens:
     """
     A data class that stores the instruction tokens and provides easy
     access to the token values.
     """
+    __slots__ = ("_top", "_tok", "_extra")
+
     def __init__(self, tokens: dict) -> None:
         self._top = tokens if tokens else {}
         self._tok = {} if "tok" not in tokens else tokens
@@ -64,12 +66,11 @@ class LexerResults:
     error information (via the Error object). All methods return None if
     it's value doesn't exist either due to no data present.
     """
-    _raw: dict = {}
-    _tok: LexerTokens = {}
+    __slots__ = ("_raw", "_tok")
 
     def __init__(self, raw_results: dict, tokens: LexerTokens) -> None:
-        self._raw = {} if raw_results is None else raw_results
-        self._tok = {} if tokens is None else tokens
+        self._raw: dict = {} if raw_results is None else raw_results
+        self._tok: LexerTokens = {} if tokens is None else tokens
 
     def lexer_tokens(self) -> LexerTokens:
         """
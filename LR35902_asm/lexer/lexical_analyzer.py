@@ -18,17 +18,18 @@ Becomes:
               which lin efrom the input stream this code has been read from.
 
 """
-import pprint
 from typing import List, Dict
 
-from .reader import Reader, BufferReader
-from .label import LabelUtils
-from .exception import ErrorCode, Error
-from .constants import DIRECTIVES, STORAGE_DIRECTIVES, DIR, TOK, ARGS, PARM
-from .constants import NODE, MULT, EQU, LBL, INST, STOR, SEC, BAD
-from .registers import Registers
-from .instruction_set import InstructionSet as IS
+from ..core.reader import Reader, BufferReader
+from ..core.label import LabelUtils
+from ..core.exception import ErrorCode, Error
+from ..core.constants import DIR, TOK, ARGS, PARM
+from ..core.constants import DIRECTIVE_TYPES
+from ..core.constants import NODE, MULT, EQU, LBL, INST, SEC, BAD
+from ..core.registers import Registers
+from ..instructions.instruction_set import InstructionSet as IS
 from .lexical_node import LexicalNode
+from .lexer_parser import _MNEMONIC_FIRST_CHARS, _TOKEN_RE, _join_parens
 
 
 class LexicalAnalyzer:
@@ -42,7 +43,6 @@ class LexicalAnalyzer:
     def __init__(self):
         self._line_no = 0
         self._nodes: List[LexicalNode] = []
-        self._pp = pprint.PrettyPrinter(indent=2, compact=False, width=40)
         self._notifications: List[Error] = []
 
     def analyze_buffer(self, reader: Reader, append=True) -> List[Dict]:
@@ -55,9 +55,11 @@ class LexicalAnalyzer:
         - append (bool): Keyword argument to indicate if the results of the
             lexical analysis are to be appended to the internal list of tokens
             or not. Default is True"""
-        token_list: List[LexicalNode] = []
-        while reader.is_eof() is False:
-            line = reader.read_line()
+        lines = reader.read_all_lines()
+        # At most one node per line so size the list up front and trim it.
+        token_list: List[LexicalNode] = [None] * len(lines)
+        count = 0
+        for line in lines:
             if len(line.strip()) == 0:
                 continue
             try:
@@ -68,10 +70,12 @@ class LexicalAnalyzer:
                     print(line)
                     continue
                 # tok['source_line'] = self._line_no
-                token_list.append(node)
+                token_list[count] = node
+                count += 1
             except:
                 err = Error(ErrorCode.INVALID_SYNTAX, f"Line: {line}")
                 self._notifications.append(err)
+        del token_list[count:]
         if append:
             self._nodes.extend(token_list)
         return token_list
@@ -81,7 +85,7 @@ class LexicalAnalyzer:
             return LexicalNode()
         if len(line) and line[0] == "*":  # This is a line comment - ignore it.
             return LexicalNode()
-        line = line.upper().split(";")[0].strip()  # drop comments
+        line = line.partition(";")[0].strip().upper()  # drop comments
         if len(line) == 0:
             return LexicalNode()
         return LexicalAnalyzer._tokenize(line)
@@ -95,37 +99,32 @@ class LexicalAnalyzer:
         Tokenizes a line of text into usable assembler chunks. Chunks are
         validated and a tokenized dictionary is returned.
         """
-        clean = line.strip().split(';')[0]
-        if not clean:
+        # analyze_string() has already dropped the comment and whitespace.
+        if not line:
             return LexicalNode(None, None)  # Empy line
         tokens = {}
-        clean = LexicalAnalyzer._join_parens(line)
-        clean_split = clean.replace(',', ' ').split()
-        if clean_split[0] in DIRECTIVES:
-            tokens[DIR] = clean_split[0]
+        clean = _join_parens(line)
+        clean_split = _TOKEN_RE.findall(clean)
+        kind = DIRECTIVE_TYPES.get(clean_split[0])
+        if kind is not None:
+            tokens[DIR] = kind
             tokens[TOK] = clean_split
-        elif clean_split[0] in STORAGE_DIRECTIVES:
-            tokens[DIR] = STOR
-            tokens[TOK] = clean_split
-        elif IS().is_mnemonic(clean_split[0]):
+        elif clean_split[0][0] in _MNEMONIC_FIRST_CHARS and \
+                IS().is_mnemonic(clean_split[0]):
             tokens[DIR] = INST
             tokens[TOK] = clean_split
         elif line[0] in LabelUtils.valid_label_first_char():
             if LabelUtils.is_valid_label(clean_split[0]):
                 tokens[DIR] = LBL
                 if len(clean_split) > 1:
-                    compound = [LexicalNode(LBL, clean_split[0])]
-                    tokens[DIR] = MULT
-                    remainder = ' '.join(clean_split[1:])
-                    try:
-                        more = LexicalAnalyzer._tokenize(remainder)
-                        if more.directive() == LBL:
-                            tokens[DIR] = BAD
-                        compound.append(more)
-                    except:
-                        tokens[DIR] = BAD
+                    # Labels can't nest so the rest of the line is
+                    # classified in place from the tokens already split.
+                    remainder = clean_split[1:]
+                    more_kind = LexicalAnalyzer._classify(remainder[0])
                     # LBL that has a value that's also a LBL is invalid
-                    tokens[TOK] = compound
+                    tokens[DIR] = MULT if more_kind not in (LBL, BAD) else BAD
+                    tokens[TOK] = [LexicalNode(LBL, clean_split[0]),
+                                   LexicalNode(more_kind, remainder)]
                 else:
                     tokens[TOK] = clean_split[0]
         if not tokens:
@@ -134,16 +133,14 @@ class LexicalAnalyzer:
         return LexicalNode(tokens[DIR], tokens[TOK])
 
     @classmethod
-    def _join_parens(cls, line) -> str:
-        new_str = ""
-        paren = 0
-        for c in line:
-            if c == " " and paren > 0:
-                continue
-            if c in "([{":
-                paren += 1
-            elif c in ")]}":
-                paren -= 1
-            paren = max(0, paren)  # If Negative set to 0
-            new_str += c
-        return new_str
+    def _classify(cls, first: str) -> str:
+        """Returns the directive of a single token, or BAD."""
+        kind = DIRECTIVE_TYPES.get(first)
+        if kind is not None:
+            return kind
+        if first[0] in _MNEMONIC_FIRST_CHARS and IS().is_mnemonic(first):
+            return INST
+        if first[0] in LabelUtils.valid_label_first_char() and \
+                LabelUtils.is_valid_label(first):
+            return LBL
+        return BAD
@@ -1,7 +1,7 @@
 #
 #
 from typing import Dict
-from .constants import DIR, TOK, BAD, MULT
+from ..core.constants import DIR, TOK, BAD, MULT
 
 
 class LexicalNode:
@@ -30,25 +30,28 @@ class LexicalNode:
             token is an array, it is also possible that the tokens are an
             array of LexicalNodes. This is also valid.
     """
+    # Slots instead of an inner dict so reading DIR/TOK is an attribute load.
+    __slots__ = ("_directive", "_tokens")
 
     def __init__(self, directive: str = None, tokens=None):
         # The intention is to make this object immutable but we're not using
         # the new 3.7 feature for a frozen data class.
         # Be a good neighbor and don't access underscore variables outside of
         # the scope of this class :)
-        self._data = {DIR: directive, TOK: tokens}
+        self._directive = directive
+        self._tokens = tokens
         if not LexicalNode.is_valid_node(self):
-            raise TypeError(self._data)
+            raise TypeError(self.value())
 
     def __getitem__(self, key):
-        if key in [TOK, DIR]:
-            return self._data[key]
+        if key == DIR:
+            return self._directive
+        if key == TOK:
+            return self._tokens
         raise IndexError(key)
 
     def __contains__(self, key) -> bool:
-        if key in [DIR, TOK]:
-            return key in self._data.keys()
-        return False
+        return key == DIR or key == TOK
 
     #
     # Should this be a mutable class? For now, NO and we try our best to do
@@ -75,8 +78,8 @@ class LexicalNode:
         desc = "\n LexicalNode: \n"
         desc += f"    directive = {self.directive()}\n"
         desc += f"    tokens = {self.token()}"
-        if self._data[TOK] is not None:
-            item = self._data[TOK]
+        if self._tokens is not None:
+            item = self._tokens
             if DIR in item and TOK in item:
                 x = LexicalNode(item[DIR], item[TOK])
                 desc += "\n>>> Inner LexicalNode\n" + x.__str__()
@@ -98,22 +101,22 @@ class LexicalNode:
         """Return the current DIR value."""
         """This value can also be accessed as 'variable[DIR]'. It is possible
         for this value to be None."""
-        return self._data[DIR]
+        return self._directive
 
     def token(self):
         """Return the current TOK value."""
         """This value can also be accessed as 'variable[TOK]'. It is possible
         for this value to be None."""
-        return self._data[TOK]
+        return self._tokens
 
     def value(self) -> Dict:
         """Return the current LexicalNode as a raw dictionary."""
         """Please note that this is a copy of the LexicanNode and not a
         reference to the actual values."""
-        return {DIR: self[DIR], TOK: self[TOK]}
+        return {DIR: self._directive, TOK: self._tokens}
 
     def _repr_of_instance(self) -> str:
-        return f"LexicalNode(\"{self._data[DIR]}\", \"{self._data[TOK]}\")"
+        return f"LexicalNode(\"{self._directive}\", \"{self._tokens}\")"
 
     @classmethod
     def is_valid_node(cls, node) -> bool:
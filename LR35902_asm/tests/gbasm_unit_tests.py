@@ -3,6 +3,8 @@ import os
 import sys
 import string
 import collections
+import pickle
+import tempfile
 
 os.environ['DMGASM_ROOT'] = os.path.dirname(os.path.realpath(__file__ + "/../.."))
 #import imp
@@ -14,12 +16,14 @@ os.environ['DMGASM_ROOT'] = os.path.dirname(os.path.realpath(__file__ + "/../.."
 # except ImportError:
 #     pass
 
-from dmgasm.core import InstructionSet, BufferReader, Section, ParserException,\
+from dmgasm.core import InstructionSet, BufferReader, FileReader, Section, ParserException,\
     StorageType, Storage, Label, Labels, LabelUtils, LabelScope
 from dmgasm.core import BasicLexer, LexerResults, LexerTokens, LexicalAnalyzer
 from dmgasm.core import TOK, DIR, LBL, EQU, INST, SEC, STOR, MULT
+from dmgasm.core import Instruction, ExpressionConversion, Equate
 from dmgasm.assembler import CodeNode, CodeOffset, NodeProcessor, NodeType,\
-    CodeNode, CodeOffset
+    CodeNode, CodeOffset, Assembler
+from dmgasm.assembler.resolver import compute_relative
 
 
 class GbasmUnitTests(unittest.TestCase):
@@ -104,6 +108,155 @@ class GbasmLabelTests(unittest.TestCase):
         self.assertTrue(lbl.is_scope_global() is True,\
             "The label was expected to be global, not local in score.")
 
+    def test_labels_substitute_all(self):
+        local = Label(".sub_local:", 0xC000)
+        glob = Label("SubGlobal::", 0x12)
+        Labels().add(local)
+        Labels().add(glob)
+        try:
+            self.assertEqual(Labels().substitute_all("LD HL, .sub_local"),
+                             "LD HL, $c000")
+            self.assertEqual(Labels().substitute_all("LD A, (SubGlobal)"),
+                             "LD A, ($12)")
+            self.assertEqual(Labels().substitute_all("LD A, B"), "LD A, B")
+        finally:
+            Labels().remove(local)
+            Labels().remove(glob)
+
+    def test_labels_substitute_all_skips_literals(self):
+        cafe = Label("CAFE", 0x10)
+        loop = Label(".sub_loop:", 0xC100)
+        Labels().add(cafe)
+        Labels().add(loop)
+        try:
+            self.assertEqual(Labels().substitute_all("LD HL, $CAFE"),
+                             "LD HL, $CAFE")
+            self.assertEqual(Labels().substitute_all("LD A, CAFE"),
+                             "LD A, $10")
+            self.assertEqual(Labels().substitute_all("LD A, .CAFE"),
+                             "LD A, .CAFE")
+            self.assertEqual(Labels().substitute_all("JP sub_loop"),
+                             "JP sub_loop")
+            self.assertEqual(Labels().substitute_all("JP .sub_loop"),
+                             "JP $c100")
+        finally:
+            Labels().remove(cafe)
+            Labels().remove(loop)
+
+
+class GbasmConversionTests(unittest.TestCase):
+
+    def test_plain_decimal_converts(self):
+        ec = ExpressionConversion()
+        self.assertEqual(ec.decimal_from_expression("65500"), 65500)
+        self.assertEqual(ec.decimal_from_expression("10"), 10)
+        self.assertEqual(ec.decimal_from_expression("1"), 1)
+
+    def test_zero_prefixed_decimal_converts(self):
+        ec = ExpressionConversion()
+        self.assertEqual(ec.decimal_from_expression("0"), 0)
+        self.assertEqual(ec.decimal_from_expression("0123"), 123)
+
+    def test_each_prefix_converts(self):
+        ec = ExpressionConversion()
+        self.assertEqual(ec.decimal_from_expression("$FFD2"), 0xFFD2)
+        self.assertEqual(ec.decimal_from_expression("$0a"), 0x0A)
+        self.assertEqual(ec.decimal_from_expression("%1010"), 10)
+        self.assertEqual(ec.decimal_from_expression("&17"), 15)
+        self.assertEqual(ec.decimal_from_expression("0255"), 255)
+
+    def test_invalid_expressions_return_none(self):
+        ec = ExpressionConversion()
+        for text in ["$", "$FG", "%102", "&8", "0x1F", "LABEL", "(HL)", ""]:
+            self.assertIsNone(ec.decimal_from_expression(text),
+                              f"'{text}' should not convert.")
+
+    def test_repeated_conversion_returns_same_value(self):
+        ec = ExpressionConversion()
+        first = ec.decimal_from_expression("$1234")
+        self.assertEqual(first, 0x1234)
+        self.assertEqual(ec.decimal_from_expression("$1234"), first)
+        self.assertIsNone(ec.decimal_from_expression("$XYZ"))
+        self.assertIsNone(ec.decimal_from_expression("$XYZ"))
+
+
+class GbasmEquateTests(unittest.TestCase):
+
+    def test_parse_all_matches_from_string(self):
+        lines = ["COUNT EQU $FFD2",
+                 "  small equ $10   ; a comment",
+                 "BIGVAL EQU 65500",
+                 "SUM EQU $10 + 2",
+                 "LD A, B",
+                 "NOVALUE EQU"]
+        expected = []
+        for line in lines:
+            equ = Equate.from_string(line)
+            equ.parse()
+            if equ.name() is not None:
+                expected.append((equ.name(), equ.value()))
+        found = [(label.name(), label.value())
+                 for label in Equate.parse_all("\n".join(lines))]
+        self.assertEqual(found, expected)
+        self.assertEqual([name for name, _ in found],
+                         ["COUNT", "SMALL", "BIGVAL"])
+
+
+class GbasmLexerTests(unittest.TestCase):
+
+    def _lex_cached(self, path, cache_dir):
+        with FileReader(path) as reader:
+            tokens = BasicLexer(reader, cache_dir=cache_dir).tokenize()
+            self.assertTrue(reader.is_eof())
+        return tokens
+
+    def test_tokenize_files(self):
+        sources = {"first.asm": "LD A, $10\nNOP\n",
+                   "second.asm": "NOP\nHALT\nNOP\n"}
+        with tempfile.TemporaryDirectory() as work_dir:
+            paths = []
+            for name, text in sources.items():
+                path = os.path.join(work_dir, name)
+                with open(path, "w") as source:
+                    source.write(text)
+                paths.append(path)
+            lexed = BasicLexer.tokenize_files(paths)
+        self.assertEqual(sorted(lexed), sorted(paths))
+        for path in paths:
+            reader = BufferReader(sources[os.path.basename(path)])
+            self.assertEqual(lexed[path], BasicLexer(reader).tokenize())
+
+    def test_token_cache_miss_hit_and_stale(self):
+        with tempfile.TemporaryDirectory() as work_dir:
+            path = os.path.join(work_dir, "cached.asm")
+            cache_dir = os.path.join(work_dir, "cache")
+            with open(path, "w") as source:
+                source.write("LD A, $10\nNOP\n")
+
+            # Miss: the file is lexed and one cache file is written.
+            first = self._lex_cached(path, cache_dir)
+            cached = os.listdir(cache_dir)
+            self.assertEqual(len(cached), 1)
+
+            # Hit: the tokens come from the cache file, not the source.
+            cache_path = os.path.join(cache_dir, cached[0])
+            with open(cache_path, "rb") as cache:
+                self.assertEqual(pickle.load(cache), first)
+            marker = [{"source_line": 1, "marker": True}]
+            with open(cache_path, "wb") as cache:
+                pickle.dump(marker, cache)
+            self.assertEqual(self._lex_cached(path, cache_dir), marker)
+
+            # Stale: an edited file gets a new key, is lexed again and its
+            # cache file replaces the old one.
+            with open(path, "w") as source:
+                source.write("LD A, $10\nNOP\nHALT\n")
+            third = self._lex_cached(path, cache_dir)
+            self.assertEqual(len(third), len(first) + 1)
+            refreshed = os.listdir(cache_dir)
+            self.assertEqual(len(refreshed), 1)
+            self.assertNotEqual(refreshed, cached)
+
 
 class GbasmCompileTests(unittest.TestCase):
     def test_section_IP_init(self):
@@ -138,6 +291,14 @@ class GbasmCompileTests(unittest.TestCase):
         print("\n")
         print(nodes)
 
+    def test_buffer_reader_read_all_lines(self):
+        reader = BufferReader("LD A, B\nCP A\n")
+        lines = reader.read_all_lines()
+        self.assertTrue(lines == ["LD A, B", "CP A"], \
+            "read_all_lines() returned unexpected lines.")
+        self.assertTrue(reader.is_eof(), \
+            "The reader should be at eof after read_all_lines().")
+
     def test_lexer_tokenize(self):
         code1 = """
         SECTION 'game_stuff', ROM0   ; Initial section
@@ -167,6 +328,64 @@ class GbasmCompileTests(unittest.TestCase):
         #     for n in nodes:
         #         print(n)
 
+    def test_forward_references_resolve_in_pass2(self):
+        code = """
+        SECTION "forward", ROMX
+            JR .fwd_skip        ; $4000: 18 03
+            JP .fwd_done        ; $4002: C3 07 40
+        .fwd_skip:
+            NOP                 ; $4005
+            NOP                 ; $4006
+        .fwd_done:
+            NOP                 ; $4007
+        """
+        asm = Assembler()
+        asm.load_from_buffer(code)
+        asm.parse()
+        binary = b"".join(bytes(node.code_obj.machine_code())
+                          for node in asm.code if node.type_name == INST)
+        self.assertEqual(binary, bytes([0x18, 0x03, 0xC3, 0x07, 0x40,
+                                        0x00, 0x00, 0x00]),
+                         "Forward JR/JP were not resolved to their labels.")
+
+    def test_conditional_jumps_and_calls_resolve_labels(self):
+        code = """
+        SECTION "conditional", ROMX
+        .cond_top:
+            NOP                 ; $4000
+            JR NZ, .cond_top    ; $4001: 20 FD
+            JR Z, .cond_end     ; $4003: 28 03
+            CALL .cond_top      ; $4005: CD 00 40
+        .cond_end:
+            LD A, 0             ; $4008: 3E 00
+        """
+        asm = Assembler()
+        asm.load_from_buffer(code)
+        asm.parse()
+        binary = b"".join(bytes(node.code_obj.machine_code())
+                          for node in asm.code if node.type_name == INST)
+        self.assertEqual(binary, bytes([0x00, 0x20, 0xFD, 0x28, 0x03,
+                                        0xCD, 0x00, 0x40, 0x3E, 0x00]))
+
+    def test_relative_offsets_count_from_the_next_instruction(self):
+        self.assertEqual(compute_relative(0x4002, 0x4005), 0x03)
+        self.assertEqual(compute_relative(0x4002, 0x4002), 0x00)
+        self.assertEqual(compute_relative(0x4002, 0x4000), 0xFE)
+        self.assertIsNone(compute_relative(0x4002, 0x4082))
+        self.assertIsNone(compute_relative(0x4082, 0x4001))
+
+    def test_repeated_instructions_keep_their_own_bytes(self):
+        first = Instruction.from_string("LD A, $05")
+        other = Instruction.from_string("LD A, $10")
+        again = Instruction.from_string("LD A, $05")
+        self.assertEqual(bytes(first.machine_code()), bytes([0x3E, 0x05]))
+        self.assertEqual(bytes(other.machine_code()), bytes([0x3E, 0x10]))
+        self.assertEqual(bytes(again.machine_code()), bytes([0x3E, 0x05]),
+                         "A cached parse was overwritten by a later one.")
+        self.assertIsNot(first.parse_result().lexer_tokens(),
+                         again.parse_result().lexer_tokens(),
+                         "Parsed instructions should not share tokens.")
+
 
 if __name__ == "__main__":
     print("\nTesting Parser methods")